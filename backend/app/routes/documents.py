@@ -107,11 +107,18 @@ async def upload_document(
                 detail="File is empty",
             )
 
+        # Never let a client-supplied name carry path components into the S3 key;
+        # the document keeps the name the user uploaded, capped to the column size
+        from app.services.document_processor import MAX_FILENAME_LENGTH, sanitize_filename
+
+        original_filename = (file.filename or "unnamed")[:MAX_FILENAME_LENGTH]
+        safe_filename = sanitize_filename(file.filename or "unnamed")
+
         # Upload to S3
         s3_service = S3Service()
         upload_result = await s3_service.upload_document(
             file_content=file_content,
-            filename=file.filename or "unnamed",
+            filename=safe_filename,
             user_id=current_user.id,
             document_type=file.content_type or "application/octet-stream",
         )
@@ -120,7 +127,7 @@ async def upload_document(
         document_data = {
             "id": str(uuid4()),
             "user_id": current_user.id,
-            "filename": file.filename or "unnamed",
+            "filename": original_filename,
             "file_type": file.content_type or "application/octet-stream",
             "size": file_size,
             "s3_reference": {
@@ -1080,12 +1080,29 @@ class TextractService:
 class ComprehendService:
     """AWS Comprehend service for NLP analysis."""
 
+    # Comprehend's per-document size limit, in UTF-8 bytes
+    MAX_TEXT_BYTES = 5000
+
     def __init__(self):
         """Initialize Comprehend service."""
         self.session = aioboto3.Session()
         self.region = settings.aws.aws_region
         self.circuit_breaker = CircuitBreaker()
 
+    @classmethod
+    def _truncate_to_limit(cls, text: str) -> str:
+        """
+        Truncate text to MAX_TEXT_BYTES of UTF-8 without splitting a character.
+
+        A UTF-8 character is at most 4 bytes, so short texts skip the encode.
+        """
+        if len(text) * 4 <= cls.MAX_TEXT_BYTES:
+            return text
+        text_bytes = text.encode("utf-8")
+        if len(text_bytes) <= cls.MAX_TEXT_BYTES:
+            return text
+        return text_bytes[: cls.MAX_TEXT_BYTES].decode("utf-8", errors="ignore")
+
     def _get_boto_config(self) -> Config:
         """Get boto3 configuration."""
         return Config(
@@ -1129,11 +1146,10 @@ class ComprehendService:
             start_time = time.time()
 
             # Truncate if too long (Comprehend limit is 5000 bytes)
-            max_bytes = 5000
-            text_bytes = text.encode("utf-8")
-            if len(text_bytes) > max_bytes:
-                text = text_bytes[:max_bytes].decode("utf-8", errors="ignore")
-                logger.warning(f"Text truncated to {max_bytes} bytes for Comprehend")
+            truncated = self._truncate_to_limit(text)
+            if len(truncated) < len(text):
+                logger.warning(f"Text truncated to {self.MAX_TEXT_BYTES} bytes for Comprehend")
+            text = truncated
 
             async with self.session.client(
                 "comprehend",
@@ -1241,10 +1257,7 @@ class ComprehendService:
             start_time = time.time()
 
             # Truncate if too long
-            max_bytes = 5000
-            text_bytes = text.encode("utf-8")
-            if len(text_bytes) > max_bytes:
-                text = text_bytes[:max_bytes].decode("utf-8", errors="ignore")
+            text = self._truncate_to_limit(text)
 
             async with self.session.client(
                 "comprehend",
@@ -1319,10 +1332,7 @@ class ComprehendService:
             start_time = time.time()
 
             # Truncate if too long
-            max_bytes = 5000
-            text_bytes = text.encode("utf-8")
-            if len(text_bytes) > max_bytes:
-                text = text_bytes[:max_bytes].decode("utf-8", errors="ignore")
+            text = self._truncate_to_limit(text)
 
             async with self.session.client(
                 "comprehend",
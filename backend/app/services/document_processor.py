@@ -34,6 +34,7 @@ import json
 import re
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -56,6 +57,49 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Text cleanup and LLM response patterns, compiled once at import
+WHITESPACE_RE = re.compile(r"\s+")
+DISALLOWED_CHARS_RE = re.compile(r"[^\w\s\.,!?\-:;()\[\]{}\"\'@#$%&*+=/<>]")
+NEWLINES_RE = re.compile(r"\n+")
+CODE_FENCE_OPEN_RE = re.compile(r"```json?\n?")
+CODE_FENCE_CLOSE_RE = re.compile(r"```\n?$")
+UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^\w.\- ]")
+REPEATED_DOTS_RE = re.compile(r"\.{2,}")
+
+MAX_FILENAME_LENGTH = 255
+
+
+@lru_cache(maxsize=4096)
+def sanitize_filename(filename: str) -> str:
+    """
+    Make an uploaded filename safe for storage keys and local paths.
+
+    Drops directory components, replaces unsafe characters with underscores and
+    collapses dot runs so the result can't traverse directories. Cached because
+    re-uploads and retries sanitize the same names repeatedly.
+
+    Args:
+        filename: Client-supplied filename
+
+    Returns:
+        Sanitized filename ("unnamed" if nothing usable remains)
+
+    Example:
+        sanitize_filename("../../etc/passwd")  # -> "passwd"
+    """
+    name = filename.replace("\\", "/").rsplit("/", 1)[-1]
+    name = UNSAFE_FILENAME_CHARS_RE.sub("_", name)
+    name = REPEATED_DOTS_RE.sub(".", name).strip(". ")
+
+    if len(name) > MAX_FILENAME_LENGTH:
+        stem, dot, extension = name.rpartition(".")
+        if dot and len(extension) < 16:
+            name = stem[: MAX_FILENAME_LENGTH - len(extension) - 1] + dot + extension
+        else:
+            name = name[:MAX_FILENAME_LENGTH]
+
+    return name or "unnamed"
+
 
 # ============================================================================
 # Processing State Machine
@@ -257,6 +301,11 @@ class DocumentProcessor:
         except Exception as e:
             logger.error(f"Failed to save checkpoint: {e}")
 
+    @staticmethod
+    def sanitize_filename(filename: str) -> str:
+        """Sanitize a client-supplied filename (see module-level sanitize_filename)."""
+        return sanitize_filename(filename)
+
     def _check_cancellation(self, document_id: str) -> None:
         """
         Check if processing was cancelled.
@@ -742,13 +791,13 @@ class DocumentProcessor:
             Cleaned text
         """
         # Remove excessive whitespace
-        text = re.sub(r"\s+", " ", text)
+        text = WHITESPACE_RE.sub(" ", text)
 
         # Remove special characters but keep punctuation
-        text = re.sub(r"[^\w\s\.,!?\-:;()\[\]{}\"\'@#$%&*+=/<>]", "", text)
+        text = DISALLOWED_CHARS_RE.sub("", text)
 
         # Normalize line breaks
-        text = re.sub(r"\n+", "\n", text)
+        text = NEWLINES_RE.sub("\n", text)
 
         # Trim
         text = text.strip()
@@ -814,8 +863,8 @@ Provide ONLY the JSON array, no other text."""
 
             # Remove markdown code blocks if present
             if response_text.startswith("```"):
-                response_text = re.sub(r"```json?\n?", "", response_text)
-                response_text = re.sub(r"```\n?$", "", response_text)
+                response_text = CODE_FENCE_OPEN_RE.sub("", response_text)
+                response_text = CODE_FENCE_CLOSE_RE.sub("", response_text)
                 response_text = response_text.strip()
 
             action_items = json.loads(response_text)
@@ -927,8 +976,8 @@ Provide ONLY the JSON array, no other text."""
 
             # Remove markdown code blocks
             if response_text.startswith("```"):
-                response_text = re.sub(r"```json?\n?", "", response_text)
-                response_text = re.sub(r"```\n?$", "", response_text)
+                response_text = CODE_FENCE_OPEN_RE.sub("", response_text)
+                response_text = CODE_FENCE_CLOSE_RE.sub("", response_text)
                 response_text = response_text.strip()
 
             risks = json.loads(response_text)
@@ -1032,8 +1081,8 @@ Provide ONLY the JSON object, no other text."""
             response_text = response["text"].strip()
 
             if response_text.startswith("```"):
-                response_text = re.sub(r"```json?\n?", "", response_text)
-                response_text = re.sub(r"```\n?$", "", response_text)
+                response_text = CODE_FENCE_OPEN_RE.sub("", response_text)
+                response_text = CODE_FENCE_CLOSE_RE.sub("", response_text)
                 response_text = response_text.strip()
 
             claude_entities = json.loads(response_text)
@@ -1112,8 +1161,8 @@ Provide ONLY the JSON object, no other text."""
             response_text = response["text"].strip()
 
             if response_text.startswith("```"):
-                response_text = re.sub(r"```json?\n?", "", response_text)
-                response_text = re.sub(r"```\n?$", "", response_text)
+                response_text = CODE_FENCE_OPEN_RE.sub("", response_text)
+                response_text = CODE_FENCE_CLOSE_RE.sub("", response_text)
                 response_text = response_text.strip()
 
             summary = json.loads(response_text)
@@ -1289,17 +1338,13 @@ Provide ONLY the JSON object, no other text."""
             estimated_cost = self._estimate_batch_cost(documents)
             logger.info(f"Estimated batch cost: ${estimated_cost:.4f}")
 
-        # Process in batches
-        results = []
-        failed = []
-
-        for i in range(0, len(documents), max_parallel):
-            batch = documents[i : i + max_parallel]
+        # Keep at most max_parallel documents in flight; a slot frees up as soon
+        # as any document finishes, so one slow document doesn't stall the rest
+        semaphore = asyncio.Semaphore(max_parallel)
 
-            # Process batch in parallel
-            tasks = []
-            for doc in batch:
-                task = self.process_document(
+        async def process_one(doc: dict[str, Any]) -> dict[str, Any]:
+            async with semaphore:
+                return await self.process_document(
                     document_id=doc["document_id"],
                     user_id=user_id,
                     file_path=doc["file_path"],
@@ -1307,22 +1352,26 @@ Provide ONLY the JSON object, no other text."""
                     document_type=doc.get("document_type", DocumentType.GENERAL),
                     processing_options=doc.get("options", {}),
                 )
-                tasks.append(task)
 
-            # Wait for batch to complete
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+        batch_results = await asyncio.gather(
+            *(process_one(doc) for doc in documents),
+            return_exceptions=True,
+        )
 
-            for doc, result in zip(batch, batch_results, strict=False):
-                if isinstance(result, Exception):
-                    failed.append(
-                        {
-                            "document_id": doc["document_id"],
-                            "error": str(result),
-                        }
-                    )
-                    logger.error(f"Batch processing failed for {doc['document_id']}: {result}")
-                else:
-                    results.append(result)
+        results = []
+        failed = []
+
+        for doc, result in zip(documents, batch_results, strict=False):
+            if isinstance(result, Exception):
+                failed.append(
+                    {
+                        "document_id": doc["document_id"],
+                        "error": str(result),
+                    }
+                )
+                logger.error(f"Batch processing failed for {doc['document_id']}: {result}")
+            else:
+                results.append(result)
 
         # Summary
         total_cost = sum(r.get("cost", 0) for r in results)
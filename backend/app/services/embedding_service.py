@@ -380,12 +380,8 @@ class EmbeddingService:
 
     def __init__(self):
         """Initialize embedding service."""
-        # Initialize OpenAI client
-        self.client = AsyncOpenAI(
-            api_key=settings.openai.openai_api_key,
-            timeout=60.0,
-            max_retries=0,  # We handle retries with tenacity
-        )
+        # OpenAI client, created on first use (see client property)
+        self._client: AsyncOpenAI | None = None
 
         # Default model
         self.default_model = (
@@ -402,8 +398,27 @@ class EmbeddingService:
         self.rate_limit_window = 60  # seconds
         self.request_timestamps: list[float] = []
 
+        # Chunk embeddings requested concurrently per document
+        self.max_concurrent_requests = 8
+
         logger.info(f"Embedding service initialized with model: {self.default_model}")
 
+    @property
+    def client(self) -> AsyncOpenAI:
+        """
+        OpenAI client, created once on first use.
+
+        Reusing one client keeps its HTTP connection pool warm across
+        requests instead of paying a TLS handshake per embedding call.
+        """
+        if self._client is None:
+            self._client = AsyncOpenAI(
+                api_key=settings.openai.openai_api_key,
+                timeout=60.0,
+                max_retries=0,  # We handle retries with tenacity
+            )
+        return self._client
+
     def _get_model_config(self, model: str) -> dict[str, Any]:
         """
         Get model configuration.
@@ -635,18 +650,26 @@ class EmbeddingService:
 
         logger.info(f"Generating embeddings for {len(chunks)} chunks")
 
-        # Generate embeddings for each chunk
+        # Generate embeddings for all chunks concurrently over the shared
+        # client's connection pool, capped so a long document can't burst
+        # past the rate limit
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def embed_chunk(chunk: dict[str, Any]) -> dict[str, Any]:
+            async with semaphore:
+                return await self.generate_embedding(
+                    chunk["text"],
+                    model=model,
+                    use_cache=use_cache,
+                )
+
+        results = await asyncio.gather(*(embed_chunk(chunk) for chunk in chunks))
+
         chunk_embeddings = []
         total_cost = 0.0
         cached_count = 0
 
-        for chunk in chunks:
-            result = await self.generate_embedding(
-                chunk["text"],
-                model=model,
-                use_cache=use_cache,
-            )
-
+        for chunk, result in zip(chunks, results, strict=True):
             chunk_embeddings.append(
                 {
                     "embedding": result["embedding"],
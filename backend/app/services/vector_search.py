@@ -23,18 +23,257 @@ Usage:
     )
 """
 
+import hashlib
+import time
+from collections.abc import Callable
 from datetime import datetime
+from functools import cache
 from typing import Any
 
+import numpy as np
+from cachetools import TTLCache
+
 from app.cache.redis import get_cache, set_cache
 from app.database import execute_insert, execute_query, execute_select
 from app.services.embedding_service import EmbeddingService
 from app.utils.exceptions import AIServiceError, DatabaseError
 from app.utils.logger import get_logger
 
+try:
+    import simsimd
+
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 
+# ============================================================================
+# Vector Math
+# ============================================================================
+
+
+# text-embedding-3-small output size; pairs of this length get a specialized kernel
+EMBEDDING_DIMENSIONS = 1536
+
+
+@cache
+def _numba() -> Any | None:
+    """
+    Import numba on first use, or return None when it isn't installed.
+
+    numba is an optional accelerator (see requirements-dev.txt). Importing it
+    loads LLVM, so that cost is deferred until a kernel is first needed
+    instead of being paid by every process that imports this module.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba
+
+
+@cache
+def _cosine_1536_kernel() -> Callable[[np.ndarray, np.ndarray], float] | None:
+    """Build the Numba EMBEDDING_DIMENSIONS cosine kernel on first use (None without numba)."""
+    numba = _numba()
+    if numba is None:
+        return None
+
+    @numba.njit(
+        "f4(f4[::1], f4[::1])",
+        fastmath=True,
+        boundscheck=False,
+    )
+    def kernel(a: np.ndarray, b: np.ndarray) -> float:
+        # Fixed trip count lets LLVM fully unroll and vectorize the reductions
+        dot = np.float32(0.0)
+        norm_a = np.float32(0.0)
+        norm_b = np.float32(0.0)
+        for i in range(1536):
+            ai = a[i]
+            bi = b[i]
+            dot += ai * bi
+            norm_a += ai * ai
+            norm_b += bi * bi
+        denom = np.sqrt(norm_a * norm_b)
+        if denom == 0:
+            return np.float32(0.0)
+        return dot / denom
+
+    return kernel
+
+
+def cosine_similarity(a: Any, b: Any) -> float:
+    """
+    Cosine similarity between two embedding vectors.
+
+    Uses the SimSIMD kernel when available. Without it, pairs of
+    EMBEDDING_DIMENSIONS go to a specialized Numba kernel when numba is
+    installed; the kernel is compiled on first use. Anything else is scored
+    with NumPy. Callers scoring many candidates against one query should
+    convert the query once and pass the ndarray.
+
+    Args:
+        a: First vector (list or ndarray)
+        b: Second vector (list or ndarray)
+
+    Returns:
+        Similarity in [-1, 1]; 0.0 if either vector has zero length
+    """
+    va = np.asarray(a, dtype=np.float32)
+    vb = np.asarray(b, dtype=np.float32)
+
+    if SIMSIMD_AVAILABLE:
+        # simsimd.cosine returns the cosine *distance*
+        return 1.0 - float(simsimd.cosine(va, vb))
+
+    if va.shape == vb.shape == (EMBEDDING_DIMENSIONS,):
+        kernel = _cosine_1536_kernel()
+        if kernel is not None:
+            return float(kernel(np.ascontiguousarray(va), np.ascontiguousarray(vb)))
+
+    denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
+    if not denom:
+        return 0.0
+    return float(np.dot(va, vb)) / denom
+
+
+def normalize_vector_np(vec: Any) -> np.ndarray:
+    """
+    Scale a vector to unit length as a float32 ndarray.
+
+    Zero vectors are returned unchanged rather than divided by zero.
+
+    Args:
+        vec: Input vector (list or ndarray)
+
+    Returns:
+        Unit-length float32 array
+    """
+    arr = np.asarray(vec, dtype=np.float32)
+    norm = np.linalg.norm(arr)
+    return arr / norm if norm else arr
+
+
+def normalize_vector(vec: Any) -> list[float]:
+    """Scale a vector to unit length, returned as a plain list."""
+    return normalize_vector_np(vec).tolist()
+
+
+# ============================================================================
+# In-Process Embedding Cache
+# ============================================================================
+
+
+class EmbeddingCache:
+    """
+    In-process LRU cache of embeddings with per-entry TTL.
+
+    Sits in front of the Redis cache for hot texts. Expiry and LRU eviction
+    are delegated to cachetools.TTLCache. Keys are 64-bit xxh3 digests of the
+    text rather than the text itself, so long inputs are hashed once and not
+    retained; the text length is stored with the entry as a cheap collision
+    guard.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600,
+        max_size: int = 1000,
+        time_func: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+            max_size: Maximum number of entries before LRU eviction
+            time_func: Clock used for expiry (injectable for tests)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data: TTLCache[int, tuple[int, Any]] = TTLCache(
+            maxsize=max_size, ttl=ttl, timer=time_func
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(text: str) -> int:
+        """Hash text to a 64-bit integer cache key."""
+        data = text.encode("utf-8", "ignore")
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_intdigest(data)
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+    def get(self, text: str) -> Any | None:
+        """
+        Get cached embedding for text.
+
+        Args:
+            text: Embedded text
+
+        Returns:
+            Embedding, or None on a miss or expired entry
+        """
+        key = self._key(text)
+
+        try:
+            length, embedding = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if length != len(text):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return embedding
+
+    def set(self, text: str, embedding: Any) -> None:
+        """
+        Cache embedding for text, evicting the least recently used entries.
+
+        Args:
+            text: Embedded text
+            embedding: Embedding vector
+        """
+        self._data[self._key(text)] = (len(text), embedding)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Hits, misses, current size and hit rate
+        """
+        self._data.expire()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
 # ============================================================================
 # Vector Search Service
 # ============================================================================
@@ -53,6 +292,21 @@ class VectorSearch:
 
         logger.info("Vector search service initialized")
 
+    @property
+    def client(self) -> Any:
+        """OpenAI client, shared with the embedding service and created on first use."""
+        return self.embedding_service.client
+
+    @staticmethod
+    def cosine_similarity(a: Any, b: Any) -> float:
+        """Cosine similarity between two vectors (see module-level helper)."""
+        return cosine_similarity(a, b)
+
+    @staticmethod
+    def normalize_vector(vec: Any) -> list[float]:
+        """Scale a vector to unit length (see module-level helper)."""
+        return normalize_vector(vec)
+
     async def store_document_embeddings(
         self,
         document_id: str,
@@ -432,6 +686,84 @@ class VectorSearch:
                 details={"query": query, "error": str(e)},
             )
 
+    async def keyword_search(
+        self,
+        query: str,
+        user_id: str | None = None,
+        document_type: str | None = None,
+        limit: int = 10,
+    ) -> dict[str, Any]:
+        """
+        Perform full-text keyword search on documents.
+
+        Matches against the stored ``tsv`` column through its GIN index, so
+        the lookup scales with the number of matches rather than the corpus.
+        Requires backend/migrations/add_documents_tsv.sql.
+
+        Args:
+            query: Search query text
+            user_id: Filter by user ID
+            document_type: Filter by document type
+            limit: Maximum number of results
+
+        Returns:
+            Search results ranked by ts_rank
+        """
+        try:
+            sql = """
+            SELECT
+                d.id,
+                d.filename,
+                d.document_type,
+                d.created_at,
+                d.word_count,
+                ts_rank(d.tsv, q.query) AS keyword_score
+            FROM documents d, plainto_tsquery('english', %s) AS q(query)
+            WHERE d.tsv @@ q.query
+            """
+
+            params: list[Any] = [query]
+
+            if user_id:
+                sql += " AND d.user_id = %s"
+                params.append(user_id)
+
+            if document_type:
+                sql += " AND d.document_type = %s"
+                params.append(document_type)
+
+            sql += " ORDER BY keyword_score DESC LIMIT %s"
+            params.append(limit)
+
+            results = await execute_query(sql, tuple(params))
+
+            search_results = [
+                {
+                    "document_id": row["id"],
+                    "filename": row["filename"],
+                    "document_type": row["document_type"],
+                    "created_at": (row["created_at"].isoformat() if row["created_at"] else None),
+                    "word_count": row["word_count"],
+                    "keyword_score": float(row["keyword_score"]),
+                }
+                for row in results
+            ]
+
+            logger.info(f"Keyword search: {len(search_results)} results")
+
+            return {
+                "query": query,
+                "results": search_results,
+                "total_results": len(search_results),
+            }
+
+        except Exception as e:
+            logger.error(f"Keyword search failed: {e}", exc_info=True)
+            raise DatabaseError(
+                message="Keyword search failed",
+                details={"query": query, "error": str(e)},
+            )
+
     async def find_similar_documents(
         self,
         document_id: str,
@@ -687,8 +1019,6 @@ class VectorSearch:
         limit: int,
     ) -> str:
         """Generate cache key for search results."""
-        import hashlib
-
         key_parts = [
             query,
             user_id or "all",
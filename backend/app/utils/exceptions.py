@@ -170,6 +170,13 @@ class AIServiceError(BaseAPIException):
     message = "AI service is temporarily unavailable"
 
 
+class TransientLLMError(AIServiceError):
+    """Exception raised for LLM failures that are worth retrying."""
+
+    error_code = "TRANSIENT_LLM_ERROR"
+    message = "LLM call failed with a retryable error"
+
+
 class BedrockError(AIServiceError):
     """Exception raised for AWS Bedrock-specific errors."""
 
@@ -0,0 +1,34 @@
+-- ============================================================================
+-- Add Stored Full-Text Search Column to Documents Table
+-- ============================================================================
+-- Date: 2026-10-17
+-- Purpose: Back keyword search with a stored, GIN-indexed tsvector
+--
+-- VectorSearch.keyword_search matches on documents.tsv. Keeping the
+-- tsvector stored (rather than calling to_tsvector on every row at query
+-- time) lets ts_rank reuse it, and the GIN index makes matching
+-- proportional to the number of hits.
+--
+-- Ordering: apply this BEFORE deploying code that calls keyword_search;
+-- until then that method fails with "column d.tsv does not exist".
+-- hybrid_search and get_search_suggestions still use the
+-- to_tsvector(extracted_text) expression index and do not depend on it.
+--
+-- Usage:
+--   psql $DATABASE_URL -f backend/migrations/add_documents_tsv.sql
+-- ============================================================================
+
+-- Add generated tsv column (computed on insert/update of extracted_text)
+ALTER TABLE documents
+ADD COLUMN IF NOT EXISTS tsv TSVECTOR
+GENERATED ALWAYS AS (to_tsvector('english', coalesce(extracted_text, ''))) STORED;
+
+-- Create GIN index on the stored column
+CREATE INDEX IF NOT EXISTS idx_documents_tsv
+ON documents USING gin (tsv);
+
+-- Add comment for documentation
+COMMENT ON COLUMN documents.tsv IS 'English tsvector of extracted_text for keyword search';
+
+-- Verify the changes
+\d documents;
@@ -144,6 +144,17 @@ USING GIN (to_tsvector('english', extracted_text));
 
 COMMENT ON INDEX idx_documents_extracted_text_fts IS 'Full-text search index on document text';
 
+-- Stored tsvector used by keyword search (see migrations/add_documents_tsv.sql)
+ALTER TABLE documents
+ADD COLUMN IF NOT EXISTS tsv TSVECTOR
+GENERATED ALWAYS AS (to_tsvector('english', coalesce(extracted_text, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_documents_tsv
+ON documents
+USING GIN (tsv);
+
+COMMENT ON INDEX idx_documents_tsv IS 'Full-text search index for keyword_search';
+
 
 -- ============================================================================
 -- Helper Functions
@@ -7,22 +7,30 @@ import pytest
 import os
 import tempfile
 import json
+import threading
 from datetime import datetime, timedelta
-from typing import Generator, Dict, Any
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Generator, Dict, Any, Optional
 from unittest.mock import Mock, MagicMock, patch
+from urllib.parse import unquote
 from pathlib import Path
 
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
+from passlib.context import CryptContext
 
 # Import app components
 from app.main import app
 from app.database import Base, get_db
 from app.models import User, Document, ActionItem
-from app.auth import create_access_token, hash_password
+from app.auth import create_access_token, create_refresh_token, hash_password
 from app.config import get_settings
+from app.models import user as user_model
+from app.services.document_processor import DocumentProcessor
 
 
 # ============================================================================
@@ -51,43 +59,121 @@ def set_test_environment():
             del os.environ[key]
 
 
+# Cost-4 bcrypt: same "$2b$" hash format as production, ~256x less work than cost 12
+FAST_PWD_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4)
+REAL_PWD_CONTEXT = user_model.pwd_context
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_bcrypt():
+    """
+    Swap the password context for a low-cost bcrypt one for the whole session
+    Hash strength is irrelevant to unit tests; the KDF cost dominates auth test runtime
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(user_model, "pwd_context", FAST_PWD_CONTEXT)
+        yield
+
+
+@pytest.fixture
+def real_bcrypt(monkeypatch):
+    """Restore the production-cost password context for a single test"""
+    monkeypatch.setattr(user_model, "pwd_context", REAL_PWD_CONTEXT)
+    return REAL_PWD_CONTEXT
+
+
 # ============================================================================
 # Database Fixtures
 # ============================================================================
 
-@pytest.fixture(scope="function")
-def test_db() -> Generator[Session, None, None]:
+def _enable_sqlite_savepoints(engine) -> None:
+    """
+    Let SQLAlchemy, not pysqlite, emit BEGIN so SAVEPOINTs nest correctly
+    See SQLAlchemy's pysqlite "Serializable isolation / Savepoints" notes
+    """
+    @event.listens_for(engine, "connect")
+    def _no_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def db_engine() -> Generator[Engine, None, None]:
     """
-    Create a fresh test database for each test
-    Uses in-memory SQLite for speed
+    Create the in-memory test database and its schema once per session
+    StaticPool keeps the single SQLite connection (and so the data) alive.
+    Under pytest-xdist each worker is its own session, so workers never
+    share a database.
     """
-    # Create in-memory SQLite database
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-
-    # Create all tables
+    _enable_sqlite_savepoints(engine)
     Base.metadata.create_all(bind=engine)
 
-    # Create session factory
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def db_connection(db_engine: Engine) -> Generator[Connection, None, None]:
+    """
+    Hold each module's writes in an outer transaction on the shared database
+    Module-scoped rows (test_user, admin_user) live here until the module finishes
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+
 
-    # Create session
-    db = TestingSessionLocal()
+@pytest.fixture(scope="function")
+def test_db(db_connection: Connection) -> Generator[Session, None, None]:
+    """
+    Create a test session isolated by a SAVEPOINT
+    commit() inside the test only releases nested savepoints; everything the
+    test wrote is rolled back afterwards, leaving module-scoped rows intact
+    """
+    savepoint = db_connection.begin_nested()
+    db = Session(
+        bind=db_connection,
+        join_transaction_mode="create_savepoint",
+        autoflush=False,
+    )
 
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        savepoint.rollback()
+
+
+@pytest.fixture(scope="module")
+def app_client() -> Generator[TestClient, None, None]:
+    """
+    Enter the app lifespan once per module
+    Startup (engine creation, settings, middleware) is shared by every test in it
+    """
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(scope="function")
-def client(test_db: Session) -> Generator[TestClient, None, None]:
+def client(app_client: TestClient, test_db: Session) -> Generator[TestClient, None, None]:
     """
     Create a test client with database override
+    The override points at this test's savepoint-isolated session
     """
     def override_get_db():
         try:
@@ -97,71 +183,94 @@ def client(test_db: Session) -> Generator[TestClient, None, None]:
 
     app.dependency_overrides[get_db] = override_get_db
 
-    with TestClient(app) as test_client:
-        yield test_client
+    yield app_client
 
     app.dependency_overrides.clear()
+    app_client.cookies.clear()
 
 
 # ============================================================================
 # User Fixtures
 # ============================================================================
 
-@pytest.fixture
-def test_user(test_db: Session) -> User:
-    """Create a test user"""
-    user = User(
+def _persist_for_module(connection: Connection, obj):
+    """Write obj into the module transaction so it outlives per-test savepoints"""
+    with Session(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+    ) as db:
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
+    return obj
+
+
+@pytest.fixture(scope="module")
+def test_user(db_connection: Connection) -> User:
+    """
+    Create a test user once per module
+    Tests that mutate it must load their own copy through test_db
+    """
+    return _persist_for_module(db_connection, User(
         username="testuser",
         email="test@example.com",
         hashed_password=hash_password("testpassword123"),
         is_active=True,
         is_admin=False,
-    )
-    test_db.add(user)
-    test_db.commit()
-    test_db.refresh(user)
-    return user
+    ))
 
 
-@pytest.fixture
-def admin_user(test_db: Session) -> User:
-    """Create an admin test user"""
-    user = User(
+@pytest.fixture(scope="module")
+def admin_user(db_connection: Connection) -> User:
+    """Create an admin test user once per module"""
+    return _persist_for_module(db_connection, User(
         username="adminuser",
         email="admin@example.com",
         hashed_password=hash_password("adminpassword123"),
         is_active=True,
         is_admin=True,
-    )
-    test_db.add(user)
-    test_db.commit()
-    test_db.refresh(user)
-    return user
+    ))
 
 
-@pytest.fixture
+@lru_cache(maxsize=None)
+def _token_for(sub: str, user_id: int, refresh: bool = False) -> str:
+    """Sign a token for (sub, user_id) once and reuse it for identical claims"""
+    factory = create_refresh_token if refresh else create_access_token
+    return factory(data={"sub": sub, "user_id": user_id})
+
+
+@pytest.fixture(scope="session")
+def signed_access_token() -> str:
+    """Access token for testuser/1, signed once per session"""
+    return _token_for("testuser", 1)
+
+
+@pytest.fixture(scope="session")
+def signed_refresh_token() -> str:
+    """Refresh token for testuser/1, signed once per session"""
+    return _token_for("testuser", 1, refresh=True)
+
+
+@pytest.fixture(scope="module")
 def test_token(test_user: User) -> str:
     """Generate JWT token for test user"""
-    return create_access_token(
-        data={"sub": test_user.username, "user_id": test_user.id}
-    )
+    return _token_for(test_user.username, test_user.id)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def admin_token(admin_user: User) -> str:
     """Generate JWT token for admin user"""
-    return create_access_token(
-        data={"sub": admin_user.username, "user_id": admin_user.id}
-    )
+    return _token_for(admin_user.username, admin_user.id)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def auth_headers(test_token: str) -> Dict[str, str]:
     """Generate authorization headers"""
     return {"Authorization": f"Bearer {test_token}"}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def admin_headers(admin_token: str) -> Dict[str, str]:
     """Generate admin authorization headers"""
     return {"Authorization": f"Bearer {admin_token}"}
@@ -171,23 +280,24 @@ def admin_headers(admin_token: str) -> Dict[str, str]:
 # Document Fixtures
 # ============================================================================
 
-@pytest.fixture
-def sample_pdf_file() -> Generator[Path, None, None]:
-    """Create a sample PDF file"""
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
-        # Write minimal PDF content
-        f.write(b"%PDF-1.4\n")
-        f.write(b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n")
-        f.write(b"2 0 obj\n<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n")
-        f.write(b"3 0 obj\n<< /Type /Page /Parent 2 0 R /Resources << /Font << /F1 << /Type /Font /Subtype /Type1 /BaseFont /Helvetica >> >> >> /Contents 4 0 R >>\nendobj\n")
-        f.write(b"4 0 obj\n<< /Length 44 >>\nstream\nBT /F1 12 Tf 100 700 Td (Test Document) Tj ET\nendstream\nendobj\n")
-        f.write(b"xref\n0 5\n0000000000 65535 f\n0000000009 00000 n\n0000000058 00000 n\n0000000115 00000 n\n0000000270 00000 n\ntrailer\n<< /Size 5 /Root 1 0 R >>\nstartxref\n363\n%%EOF\n")
-        filepath = Path(f.name)
+@pytest.fixture(scope="session")
+def sample_pdf_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Create a sample PDF file once per session
+    Read-only: tests that need to modify a file should write their own under tmp_path
+    """
+    filepath = tmp_path_factory.mktemp("pdfs", numbered=False) / "sample.pdf"
+    if not filepath.exists():
+        with open(filepath, "wb") as f:
+            # Write minimal PDF content
+            f.write(b"%PDF-1.4\n")
+            f.write(b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n")
+            f.write(b"2 0 obj\n<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n")
+            f.write(b"3 0 obj\n<< /Type /Page /Parent 2 0 R /Resources << /Font << /F1 << /Type /Font /Subtype /Type1 /BaseFont /Helvetica >> >> >> /Contents 4 0 R >>\nendobj\n")
+            f.write(b"4 0 obj\n<< /Length 44 >>\nstream\nBT /F1 12 Tf 100 700 Td (Test Document) Tj ET\nendstream\nendobj\n")
+            f.write(b"xref\n0 5\n0000000000 65535 f\n0000000009 00000 n\n0000000058 00000 n\n0000000115 00000 n\n0000000270 00000 n\ntrailer\n<< /Size 5 /Root 1 0 R >>\nstartxref\n363\n%%EOF\n")
 
-    yield filepath
-
-    # Cleanup
-    filepath.unlink()
+    return filepath
 
 
 @pytest.fixture
@@ -251,10 +361,69 @@ def sample_action_item(test_db: Session, test_user: User, sample_document: Docum
     return action_item
 
 
+@pytest.fixture(scope="session")
+def processor() -> DocumentProcessor:
+    """
+    Shared DocumentProcessor; its AWS service wrappers are built once per session
+    Tests must not leave checkpoints or cancellation tokens behind on it
+    """
+    return DocumentProcessor()
+
+
 # ============================================================================
 # Mock AWS Services
 # ============================================================================
 
+class _Body:
+    """Minimal stand-in for a botocore StreamingBody: read() returns fixed bytes"""
+
+    __slots__ = ("_payload",)
+
+    def __init__(self, payload: bytes):
+        self._payload = payload
+
+    def read(self, *args) -> bytes:
+        return self._payload
+
+
+# Default invoke_model bodies, encoded once at import
+_CLAUDE_RESPONSE_BODY = json.dumps({
+    'content': [
+        {
+            'type': 'text',
+            'text': 'This is a mock response from Claude.'
+        }
+    ],
+    'usage': {
+        'input_tokens': 100,
+        'output_tokens': 50
+    }
+}).encode()
+
+_COMPLETION_RESPONSE_BODY = json.dumps({
+    'completion': 'Mock LLM response',
+    'usage': {
+        'prompt_tokens': 100,
+        'completion_tokens': 50
+    }
+}).encode()
+
+
+def _default_bedrock_body(model_id: str) -> bytes:
+    """Pick the canned body matching the model family"""
+    if 'claude' in model_id.lower():
+        return _CLAUDE_RESPONSE_BODY
+    return _COMPLETION_RESPONSE_BODY
+
+
+def bedrock_response(payload: bytes) -> Dict[str, Any]:
+    """Build an invoke_model response around a pre-encoded JSON body"""
+    return {
+        'body': _Body(payload),
+        'contentType': 'application/json'
+    }
+
+
 @pytest.fixture
 def mock_s3_client():
     """Mock AWS S3 client"""
@@ -271,7 +440,7 @@ def mock_s3_client():
 
     # Mock get_object
     mock_client.get_object.return_value = {
-        'Body': MagicMock(read=lambda: b'test file content'),
+        'Body': _Body(b'test file content'),
         'ContentLength': 17
     }
 
@@ -355,47 +524,101 @@ def mock_comprehend_client():
     return mock_client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_bedrock_runtime_client():
-    """Mock AWS Bedrock Runtime client"""
+    """
+    Mock AWS Bedrock Runtime client
+    Shared by the whole session: responses are computed per call, but call
+    history accumulates, so reset_mock() before asserting on calls
+    """
     mock_client = MagicMock()
 
     # Mock invoke_model
     def mock_invoke_model(**kwargs):
         model_id = kwargs.get('modelId', '')
 
-        if 'claude' in model_id.lower():
-            response_body = {
-                'content': [
-                    {
-                        'type': 'text',
-                        'text': 'This is a mock response from Claude.'
-                    }
-                ],
-                'usage': {
-                    'input_tokens': 100,
-                    'output_tokens': 50
-                }
-            }
-        else:
-            response_body = {
-                'completion': 'Mock LLM response',
-                'usage': {
-                    'prompt_tokens': 100,
-                    'completion_tokens': 50
-                }
-            }
-
-        return {
-            'body': MagicMock(read=lambda: json.dumps(response_body).encode()),
-            'contentType': 'application/json'
-        }
+        return bedrock_response(_default_bedrock_body(model_id))
 
     mock_client.invoke_model.side_effect = mock_invoke_model
 
     return mock_client
 
 
+class _MockBedrockHandler(BaseHTTPRequestHandler):
+    """Serves Bedrock Runtime `POST /model/{modelId}/invoke` calls"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        parts = self.path.split("/")
+        model_id = unquote(parts[2]) if len(parts) > 3 and parts[1] == "model" else ""
+        body = self.server.response_for(model_id)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep test output quiet"""
+
+
+class MockBedrockServer(ThreadingHTTPServer):
+    """
+    In-process Bedrock Runtime stand-in bound to a loopback port
+    Agents reach it through the real boto3 client via AWS_ENDPOINT_URL_BEDROCK_RUNTIME
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _MockBedrockHandler)
+        self.canned_body: Optional[bytes] = None
+        self.invocations = 0
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond_with(self, body: bytes) -> None:
+        """Return `body` for every invoke_model call until reset()"""
+        self.canned_body = body
+
+    def reset(self) -> None:
+        self.canned_body = None
+        self.invocations = 0
+
+    def response_for(self, model_id: str) -> bytes:
+        self.invocations += 1
+
+        if self.canned_body is not None:
+            return self.canned_body
+
+        return _default_bedrock_body(model_id)
+
+
+@pytest.fixture(scope="session")
+def mock_bedrock_server() -> Generator[MockBedrockServer, None, None]:
+    """Start one loopback Bedrock Runtime mock for the whole test session"""
+    server = MockBedrockServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def bedrock_server(mock_bedrock_server: MockBedrockServer) -> Generator[MockBedrockServer, None, None]:
+    """Session Bedrock mock with canned responses cleared after each test"""
+    yield mock_bedrock_server
+    mock_bedrock_server.reset()
+
+
 @pytest.fixture
 def mock_aws_services(mock_s3_client, mock_textract_client, mock_comprehend_client, mock_bedrock_runtime_client):
     """Patch all AWS services"""
@@ -546,9 +769,8 @@ def generate_documents(test_db: Session, test_user: User):
         if user is None:
             user = test_user
 
-        documents = []
-        for i in range(count):
-            doc = Document(
+        documents = [
+            Document(
                 filename=f"document_{i}.pdf",
                 s3_key=f"documents/document_{i}.pdf",
                 user_id=user.id,
@@ -560,9 +782,12 @@ def generate_documents(test_db: Session, test_user: User):
                     "page_count": i + 1
                 }
             )
-            test_db.add(doc)
-            documents.append(doc)
-        test_db.commit()
+            for i in range(count)
+        ]
+        # One batched INSERT; flush (not commit) keeps attributes loaded, so
+        # reading doc.id afterwards doesn't cost a SELECT per document
+        test_db.add_all(documents)
+        test_db.flush()
         return documents
     return _generate
 
@@ -630,3 +855,22 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "slow: Slow-running tests")
     config.addinivalue_line("markers", "aws: Tests requiring AWS services")
     config.addinivalue_line("markers", "database: Tests requiring database")
+    config.addinivalue_line(
+        "markers", "xdist_group(name): Keep tests on the same pytest-xdist worker"
+    )
+
+
+# Modules whose tests share class-scoped fixtures (agents, orchestrator)
+XDIST_CLASS_GROUPED_MODULES = {"test_agents.py"}
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Pin each test class in class-grouped modules to one xdist worker
+    so class-scoped fixtures are built once per class, not once per worker.
+    Only takes effect with `--dist=loadgroup`.
+    """
+    for item in items:
+        if item.cls is None or item.path.name not in XDIST_CLASS_GROUPED_MODULES:
+            continue
+        item.add_marker(pytest.mark.xdist_group(name=f"{item.path.stem}::{item.cls.__name__}"))
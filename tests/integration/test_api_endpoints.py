@@ -252,9 +252,7 @@ class TestAgentEndpoints:
         """Test asking question to AI agent"""
         from unittest.mock import patch
 
-        with patch('boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
-
+        with patch('boto3.client', return_value=mock_bedrock_runtime_client):
             response = client.post(
                 '/api/v1/agents/ask',
                 headers=auth_headers,
@@ -278,9 +276,7 @@ class TestAgentEndpoints:
         """Test document summarization"""
         from unittest.mock import patch
 
-        with patch('boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
-
+        with patch('boto3.client', return_value=mock_bedrock_runtime_client):
             response = client.post(
                 f'/api/v1/agents/summarize/{sample_document.id}',
                 headers=auth_headers
